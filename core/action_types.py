@@ -3,7 +3,7 @@ Action Types for Automation Framework
 Defines comprehensive typing for automation actions
 """
 
-from typing import Dict, Any, List, Union, Literal, TypedDict, Optional
+from typing import Dict, Any, List, Union, Literal, TypedDict, Optional, Callable
 from enum import Enum
 
 
@@ -42,6 +42,7 @@ class TapAction(TypedDict):
     offset_y: Optional[int]  # Offset from template center in Y direction
     tap_times: Optional[int]  # Number of times to tap (default: 1)
     tap_delay: Optional[float]  # Delay between taps in seconds (default: 0.1)
+    roi: Optional[tuple[int, int, int, int]]  # Screen region (x1, y1, x2, y2) to search for the template
 
 
 class SwipeAction(TypedDict):
@@ -76,7 +77,7 @@ class ScreenshotAction(TypedDict):
 class TypingAction(TypedDict):
     """Keyboard typing action configuration"""
     type: Literal["typing"]
-    text: str
+    text: Union[str, Callable[[], str]]  # A callable is called for fresh text each time the action runs
     clear_first: Optional[bool]  # Whether to clear existing text first
     delay_before: Optional[float]
     delay_after: Optional[float]
@@ -104,6 +105,7 @@ class LoopAction(TypedDict):
     timeout: Optional[float]
     condition_likelihood: Optional[float]  # Custom detection threshold for condition template
     use_single_screenshot: Optional[bool]  # Use one screenshot for entire loop instead of per action
+    min_interval: Optional[float]  # Minimum seconds between iteration starts (None = no pacing)
 
 
 class RestartAction(TypedDict):
@@ -143,7 +145,7 @@ class StateConfig(TypedDict):
     actions: List[ActionConfig]
     macros: Optional[List[str]]  # Legacy support
     processes_items: Optional[bool]
-    next_states: List[str]
+    next_states: Union[str, List[str]]  # A single name for a fixed transition
     description: Optional[str]
     if_condition: Optional[str]  # Template to check for conditional execution
     if_true_actions: Optional[List[ActionConfig]]  # Actions to execute if condition is met
@@ -172,7 +174,8 @@ def create_tap_action(template: Optional[str], coordinates: Optional[tuple[int,
                      delay_before: Optional[float] = None, delay_after: Optional[float] = None,
                      likelihood: Optional[float] = None, timeout: Optional[float] = None,
                      offset_x: Optional[int] = None, offset_y: Optional[int] = None,
-                     tap_times: Optional[int] = None, tap_delay: Optional[float] = None) -> TapAction:
+                     tap_times: Optional[int] = None, tap_delay: Optional[float] = None,
+                     roi: Optional[tuple[int, int, int, int]] = None) -> TapAction:
     """Create a tap action configuration
     
     Args:
@@ -186,6 +189,7 @@ def create_tap_action(template: Optional[str], coordinates: Optional[tuple[int,
         offset_y: Offset from template center in Y direction
         tap_times: Number of times to tap (default: 1)
         tap_delay: Delay between taps in seconds (default: 0.1)
+        roi: Screen region (x1, y1, x2, y2) to search for the template instead of the whole screen
     """
     return {
         "type": "tap",
@@ -198,7 +202,8 @@ def create_tap_action(template: Optional[str], coordinates: Optional[tuple[int,
         "offset_x": offset_x,
         "offset_y": offset_y,
         "tap_times": tap_times,
-        "tap_delay": tap_delay
+        "tap_delay": tap_delay,
+        "roi": roi
     }
 
 
@@ -242,9 +247,9 @@ def create_screenshot_action(save_path: Optional[str] = None, process_items: Opt
     }
 
 
-def create_typing_action(text: str, clear_first: Optional[bool] = None, delay_before: Optional[float] = None,
+def create_typing_action(text: Union[str, Callable[[], str]], clear_first: Optional[bool] = None, delay_before: Optional[float] = None,
                         delay_after: Optional[float] = None, press_enter: Optional[bool] = None) -> TypingAction:
-    """Create a typing action"""
+    """Create a typing action; text may be a callable producing the text when the action runs"""
     return {
         "type": "typing",
         "text": text,
@@ -274,7 +279,8 @@ def create_conditional_action(condition: str, if_true: List[ActionConfig],
 
 def create_loop_action(actions: List[ActionConfig], max_iterations: Optional[int] = None,
                       condition: Optional[str] = None, timeout: Optional[float] = None,
-                      condition_likelihood: Optional[float] = None, use_single_screenshot: Optional[bool] = None) -> LoopAction:
+                      condition_likelihood: Optional[float] = None, use_single_screenshot: Optional[bool] = None,
+                      min_interval: Optional[float] = None) -> LoopAction:
     """Create a loop action"""
     return {
         "type": "loop",
@@ -283,7 +289,8 @@ def create_loop_action(actions: List[ActionConfig], max_iterations: Optional[int
         "condition": condition,
         "timeout": timeout,
         "condition_likelihood": condition_likelihood,
-        "use_single_screenshot": use_single_screenshot
+        "use_single_screenshot": use_single_screenshot,
+        "min_interval": min_interval
     }
 
 
@@ -323,12 +330,15 @@ def create_loop_action_with_single_screenshot(actions: List[ActionConfig], max_i
 
 def create_state_with_if_condition(if_condition: str, if_true_actions: List[ActionConfig], 
                                  timeout: Optional[int] = None, templates: Optional[List[str]] = None, 
-                                 next_states: Optional[List[str]] = None,
+                                 next_states: Optional[Union[str, List[str]]] = None,
                                  if_false_actions: Optional[List[ActionConfig]] = None,
                                  if_likelihood: Optional[float] = None,
                                  processes_items: Optional[bool] = None,
                                  description: Optional[str] = None) -> StateConfig:
-    """Create a state configuration with if condition"""
+    """Create a state configuration with if condition
+    
+    next_states may be a single state name for a fixed transition, like StateConfig.
+    """
     return {
         "timeout": timeout,
         "templates": templates or [],
@@ -397,6 +407,13 @@ def validate_action_config(action: Dict[str, Any]) -> List[str]:
         if timeout is not None:
             if not isinstance(timeout, (int, float)) or timeout <= 0.0:
                 errors.append("Tap action timeout must be a positive number")
+        # Validate roi if provided
+        roi = action.get("roi")
+        if roi is not None:
+            if (not isinstance(roi, (tuple, list)) or len(roi) != 4
+                    or not all(isinstance(value, int) and value >= 0 for value in roi)
+                    or roi[2] <= roi[0] or roi[3] <= roi[1]):
+                errors.append("Tap action roi must be (x1, y1, x2, y2) with x2 > x1 and y2 > y1")
     
     elif action_type == "swipe":
         if not action.get("start_template") and not action.get("start_coordinates"):
@@ -438,6 +455,11 @@ def validate_action_config(action: Dict[str, Any]) -> List[str]:
         if condition_likelihood is not None:
             if not isinstance(condition_likelihood, (int, float)) or condition_likelihood < 0.0 or condition_likelihood > 1.0:
                 errors.append("Loop action condition_likelihood must be a number between 0.0 and 1.0")
+        # Validate min_interval if provided
+        min_interval = action.get("min_interval")
+        if min_interval is not None:
+            if not isinstance(min_interval, (int, float)) or min_interval < 0.0:
+                errors.append("Loop action min_interval must be a non-negative number")
     
     elif action_type == "restart":
         # Validate delay_before if provided
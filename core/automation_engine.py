@@ -8,6 +8,7 @@ import threading
 import msvcrt
 import json
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from games.base_game import BaseGame
@@ -47,6 +48,10 @@ class AutomationInstance:
         # Action tracking within states
         self.current_action_index = 0
         
+        # Next-frame capture overlapped with template detection on the current one
+        self._capture_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_screenshot: Optional[Future] = None
+        
         if self.verbose:
             print(f"🔍 Instance #{instance_number}: Detailed initialization for device: {device_id}")
             print(f"   Game: {game.get_display_name()}")
@@ -140,7 +145,7 @@ class AutomationInstance:
             current_state = self.instance_data['current_state']
             
             # Get automation states to check for timeout_state
-            automation_states = self.game.get_automation_states()
+            automation_states = self.game.automation_states
             state_config = automation_states.get(current_state, {})
             timeout_state = state_config.get('timeout_state')
             
@@ -205,11 +210,10 @@ class AutomationInstance:
             elif self.verbose:
                 print(f"⚠️ Instance #{self.instance_number}: Streaming frame failed, falling back to file-based")
         
-        # Fallback to file-based screenshot
-        screenshot_bytes = self.device_manager.get_screenshot(self.device_id, save_to_file)
-        if screenshot_bytes:
-            screenshot = self.image_detector.bytes_to_image(screenshot_bytes)
-            if self.verbose and screenshot is not None:
+        # Fallback to file-based screenshot; the capture already decoded the frame
+        screenshot = self.device_manager.get_screenshot_as_image(self.device_id, save_to_file)
+        if screenshot is not None:
+            if self.verbose:
                 h, w = screenshot.shape[:2]
                 print(f"📸 Instance #{self.instance_number}: File-based screenshot captured ({w}x{h})")
             return screenshot
@@ -217,6 +221,44 @@ class AutomationInstance:
             print(f"❌ Instance #{self.instance_number}: Failed to capture screenshot")
         return None
     
+    def _prefetch_screenshot(self):
+        """Start capturing the next screenshot in the background"""
+        if self._capture_executor is None:
+            self._capture_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"capture-{self.instance_number}"
+            )
+        self._pending_screenshot = self._capture_executor.submit(self.get_screenshot)
+    
+    def _next_screenshot(self):
+        """Return the prefetched screenshot if one is pending, otherwise capture now"""
+        pending = self._pending_screenshot
+        if pending is None:
+            return self.get_screenshot()
+        self._pending_screenshot = None
+        try:
+            return pending.result()
+        except Exception as e:
+            print(f"⚠️ Instance #{self.instance_number}: Background screenshot failed: {e}")
+            return self.get_screenshot()
+    
+    def _discard_prefetched_screenshot(self):
+        """Drop a pending screenshot that no longer reflects the screen (an action ran)
+        
+        A capture that hasn't started is cancelled; one already running finishes
+        first, since the capture manager serializes captures per device.
+        """
+        pending = self._pending_screenshot
+        self._pending_screenshot = None
+        if pending is not None:
+            pending.cancel()
+    
+    def _shutdown_capture_executor(self):
+        """Stop the background capture thread"""
+        self._discard_prefetched_screenshot()
+        if self._capture_executor is not None:
+            self._capture_executor.shutdown(wait=False, cancel_futures=True)
+            self._capture_executor = None
+    
     def execute_macro(self, macro_name: str) -> bool:
         """Execute a macro for this game"""
         if self.verbose:
@@ -235,7 +277,7 @@ class AutomationInstance:
         
         return success
     
-    def execute_tap(self, template_name: Optional[str] = None, offset_x: Optional[int] = None, offset_y: Optional[int] = None, coordinates: Optional[tuple[int, int]] = None, tap_times: Optional[int] = None, tap_delay: Optional[float] = None, screenshot: Optional[np.ndarray] = None) -> bool:
+    def execute_tap(self, template_name: Optional[str] = None, offset_x: Optional[int] = None, offset_y: Optional[int] = None, coordinates: Optional[tuple[int, int]] = None, tap_times: Optional[int] = None, tap_delay: Optional[float] = None, screenshot: Optional[np.ndarray] = None, roi: Optional[tuple[int, int, int, int]] = None) -> bool:
         """Execute a tap at the saved coordinates for a detected template, with optional offset from center, or at explicit coordinates"""
         
         tap_start_time = time.time()
@@ -307,7 +349,7 @@ class AutomationInstance:
         
         # Detect the template for validation
         template_detect_start = time.time()
-        if not self.detect_template(screenshot, template_name):
+        if not self.detect_template(screenshot, template_name, roi):
             if self.verbose:
                 print(f"❌ Instance #{self.instance_number}: Template '{template_name}' not found in screenshot")
             return False
@@ -423,8 +465,8 @@ class AutomationInstance:
     
     def execute_action(self, action_config: Dict[str, Any], screenshot: Optional[np.ndarray] = None) -> bool:
         """Execute an action based on the action configuration"""
-        # Validate action configuration
-        validation_errors = validate_action_config(action_config)
+        # Validate action configuration (actions from the game's states were validated up front)
+        validation_errors = None if self.game.is_validated_action(action_config) else validate_action_config(action_config)
         if validation_errors:
             print(f"❌ Instance #{self.instance_number}: Invalid action configuration:")
             for error in validation_errors:
@@ -462,6 +504,7 @@ class AutomationInstance:
             offset_y = action_config.get('offset_y')
             tap_times = action_config.get('tap_times')
             tap_delay = action_config.get('tap_delay')
+            roi = action_config.get('roi')
             
             if self.verbose:
                 print(f"👆 Instance #{self.instance_number}: Executing tap action")
@@ -482,6 +525,8 @@ class AutomationInstance:
                     print(f"   👆 Tap times: {tap_times}")
                 if tap_delay:
                     print(f"   ⏱️ Tap delay: {tap_delay}s")
+                if roi:
+                    print(f"   🔲 Search region: {roi}")
             
             # Apply delays if specified
             if delay_before:
@@ -498,11 +543,17 @@ class AutomationInstance:
             if timeout is not None:
                 if self.verbose:
                     print(f"⏱️ Instance #{self.instance_number}: Executing tap with timeout: {timeout}s")
+                # Inside a single-screenshot loop the first attempt checks the iteration's
+                # frame, unless delay_before gave the screen time to change since
+                shared_screenshot = None if delay_before else getattr(self, '_current_screenshot', None)
                 # Try to execute tap with timeout
                 tap_start_time = time.time()
                 while time.time() - tap_start_time < timeout:
-                    # Get fresh screenshot for each retry attempt
-                    fresh_screenshot = self.get_screenshot()
+                    if shared_screenshot is not None:
+                        fresh_screenshot, shared_screenshot = shared_screenshot, None
+                    else:
+                        # Get fresh screenshot for each retry attempt
+                        fresh_screenshot = self.get_screenshot()
                     if fresh_screenshot is None:
                         if self.verbose:
                             print(f"❌ Instance #{self.instance_number}: Failed to get fresh screenshot for retry")
@@ -512,9 +563,9 @@ class AutomationInstance:
                     
                     # Execute tap with custom likelihood if specified
                     if likelihood is not None:
-                        success = self.execute_tap_with_likelihood(template_name, likelihood, offset_x, offset_y, coordinates, tap_times, tap_delay, fresh_screenshot)
+                        success = self.execute_tap_with_likelihood(template_name, likelihood, offset_x, offset_y, coordinates, tap_times, tap_delay, fresh_screenshot, roi)
                     else:
-                        success = self.execute_tap(template_name, offset_x, offset_y, coordinates, tap_times, tap_delay, fresh_screenshot)
+                        success = self.execute_tap(template_name, offset_x, offset_y, coordinates, tap_times, tap_delay, fresh_screenshot, roi)
                     
                     if success:
                         break
@@ -529,9 +580,9 @@ class AutomationInstance:
             else:
                 # Execute tap without timeout (original behavior)
                 if likelihood is not None:
-                    success = self.execute_tap_with_likelihood(template_name, likelihood, offset_x, offset_y, coordinates, tap_times, tap_delay, screenshot)
+                    success = self.execute_tap_with_likelihood(template_name, likelihood, offset_x, offset_y, coordinates, tap_times, tap_delay, screenshot, roi)
                 else:
-                    success = self.execute_tap(template_name, offset_x, offset_y, coordinates, tap_times, tap_delay, screenshot)
+                    success = self.execute_tap(template_name, offset_x, offset_y, coordinates, tap_times, tap_delay, screenshot, roi)
             
             tap_exec_time = (time.time() - tap_exec_start) * 1000
             if self.verbose:
@@ -664,6 +715,8 @@ class AutomationInstance:
             
         elif action_type == ActionType.TYPING:
             text = action_config.get('text')
+            if callable(text):
+                text = text()
             clear_first = action_config.get('clear_first', False)
             delay_before = action_config.get('delay_before')
             delay_after = action_config.get('delay_after')
@@ -847,6 +900,7 @@ class AutomationInstance:
             timeout = action_config.get('timeout')
             condition_likelihood = action_config.get('condition_likelihood')
             use_single_screenshot = action_config.get('use_single_screenshot', False)
+            min_interval = action_config.get('min_interval')
             
             if self.verbose:
                 print(f"🔄 Instance #{self.instance_number}: Executing loop action")
@@ -861,9 +915,12 @@ class AutomationInstance:
                     print(f"   🎯 Condition likelihood: {condition_likelihood}")
                 if use_single_screenshot:
                     print(f"   📸 Using single screenshot per iteration")
+                if min_interval:
+                    print(f"   ⏲️ Min interval: {min_interval}s")
             
             iteration = 0
             start_time = time.time()
+            iteration_start = None
             
             while True:
                 # Check max iterations
@@ -872,6 +929,14 @@ class AutomationInstance:
                         print(f"   🔢 Instance #{self.instance_number}: Reached max iterations ({max_iterations})")
                     break
                 
+                # Pace iterations when the loop asks for it; only the part of the
+                # interval not already spent capturing and matching is slept
+                if min_interval and iteration_start is not None:
+                    remaining_interval = min_interval - (time.time() - iteration_start)
+                    if remaining_interval > 0:
+                        time.sleep(remaining_interval)
+                iteration_start = time.time()
+                
                 # Check timeout
                 if timeout and time.time() - start_time > timeout:
                     if self.verbose:
@@ -1032,14 +1097,14 @@ class AutomationInstance:
             print(f"❌ Instance #{self.instance_number}: Unsupported action type: {action_type}")
             return False
     
-    def detect_template(self, screenshot, template_name: str) -> bool:
-        """Detect a template in the screenshot"""
+    def detect_template(self, screenshot, template_name: str, roi: Optional[tuple[int, int, int, int]] = None) -> bool:
+        """Detect a template in the screenshot, optionally only within roi (x1, y1, x2, y2)"""
         import time
         start_time = time.time()
         
         threshold = self.game.get_template_threshold(template_name)
         detected = self.image_detector.detect_game_template(
-            screenshot, self.game.get_game_name(), template_name, threshold
+            screenshot, self.game.get_game_name(), template_name, threshold, roi
         )
         
         detection_time = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -1047,13 +1112,13 @@ class AutomationInstance:
         
         return detected
     
-    def detect_template_with_likelihood(self, screenshot, template_name: str, likelihood: float) -> bool:
-        """Detect a template in the screenshot with custom likelihood threshold"""
+    def detect_template_with_likelihood(self, screenshot, template_name: str, likelihood: float, roi: Optional[tuple[int, int, int, int]] = None) -> bool:
+        """Detect a template in the screenshot with custom likelihood threshold, optionally only within roi"""
         import time
         start_time = time.time()
         
         detected = self.image_detector.detect_game_template(
-            screenshot, self.game.get_game_name(), template_name, likelihood
+            screenshot, self.game.get_game_name(), template_name, likelihood, roi
         )
         
         detection_time = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -1061,7 +1126,7 @@ class AutomationInstance:
         
         return detected
     
-    def execute_tap_with_likelihood(self, template_name: str, likelihood: float, offset_x: Optional[int] = None, offset_y: Optional[int] = None, coordinates: Optional[tuple[int, int]] = None, tap_times: Optional[int] = None, tap_delay: Optional[float] = None, screenshot: Optional[np.ndarray] = None) -> bool:
+    def execute_tap_with_likelihood(self, template_name: str, likelihood: float, offset_x: Optional[int] = None, offset_y: Optional[int] = None, coordinates: Optional[tuple[int, int]] = None, tap_times: Optional[int] = None, tap_delay: Optional[float] = None, screenshot: Optional[np.ndarray] = None, roi: Optional[tuple[int, int, int, int]] = None) -> bool:
         """Execute a tap at the saved coordinates for a detected template with custom likelihood and optional offset, or at explicit coordinates"""
         
         # Use provided screenshot or get a new one
@@ -1123,7 +1188,7 @@ class AutomationInstance:
             return success
         
         # Detect template with custom likelihood for validation
-        if not self.detect_template_with_likelihood(screenshot, template_name, likelihood):
+        if not self.detect_template_with_likelihood(screenshot, template_name, likelihood, roi):
             print(f"❌ Instance #{self.instance_number}: Template '{template_name}' not detected with likelihood {likelihood}")
             return False
         
@@ -1278,13 +1343,13 @@ class AutomationInstance:
             return False
         
         # Get automation states from game
-        automation_states = self.game.get_automation_states()
+        automation_states = self.game.automation_states
         
         try:
             while self.running:
                 current_time = time.time()
                 
-                screenshot = self.get_screenshot()
+                screenshot = self._next_screenshot()
                 if screenshot is None:
                     continue
                 
@@ -1310,6 +1375,11 @@ class AutomationInstance:
                 if self.verbose and templates:
                     print(f"🔍 Instance #{self.instance_number}: Checking templates: {templates}")
                 
+                # Pull the next frame over ADB while matching runs on this one; if nothing
+                # matches, the screen is unchanged and the next iteration uses it directly
+                if templates:
+                    self._prefetch_screenshot()
+                
                 for template in templates:
                     if self.detect_template(screenshot, template):
                         template_detected = True
@@ -1328,6 +1398,9 @@ class AutomationInstance:
                     template_detected or
                     (not templates and (actions or macros))
                 )
+                if should_execute_actions:
+                    # Actions change the screen, so the prefetched frame is stale
+                    self._discard_prefetched_screenshot()
                 
                 # Special handling for "completed" state - trigger session completion
                 if current_state == 'completed':
@@ -1342,7 +1415,7 @@ class AutomationInstance:
                 if not templates and not actions and not macros:
                     next_states = state_config.get('next_states', [])
                     if next_states:
-                        next_state = next_states[0]
+                        next_state = next_states if isinstance(next_states, str) else next_states[0]
                         if self.verbose:
                             print(f"🔄 Instance #{self.instance_number}: Auto-transitioning from '{current_state}' to '{next_state}' (no actions required)")
                         self.change_state(next_state)
@@ -1640,7 +1713,13 @@ class AutomationInstance:
                             print(f"🔄 Instance #{self.instance_number}: Starting state transition")
                         
                         next_states = state_config.get('next_states', [])
-                        if next_states:
+                        if isinstance(next_states, str):
+                            # Fixed transition, nothing to choose between
+                            next_state = next_states
+                            if self.verbose:
+                                print(f"🔄 Instance #{self.instance_number}: Transitioning to next state: {next_state}")
+                            self.change_state(next_state)
+                        elif next_states:
                             # Smart state selection based on cycles remaining
                             cycles_completed = self.instance_data['cycle_count']
                             cycles_needed = self.game.get_cycles_per_session()
@@ -1723,6 +1802,7 @@ class AutomationInstance:
         except Exception as e:
             print(f"❌ Instance #{self.instance_number}: Unexpected error: {e}")
         finally:
+            self._shutdown_capture_executor()
             self.stop_background_timeout_checker()
         
         return True
@@ -1741,7 +1821,7 @@ class AutomationInstance:
             
             # Calculate and show results
             detected_items = self.instance_data['detected_items']
-            total_score, score_breakdown = self.game.calculate_score(detected_items)
+            total_score, score_breakdown = self.game.calculate_score_cached(detected_items)
             
             if self.verbose:
                 print(f"📊 Instance #{self.instance_number}: Session results:")
@@ -1802,11 +1882,12 @@ class AutomationEngine:
     def __init__(self, game: BaseGame, device_manager: DeviceManager,
                  speed_multiplier: float = 1.0, inter_macro_delay: float = 0.0,
                  max_instances: int = 8, verbose: bool = False, use_streaming: bool = False,
-                 force_resume: bool = False, target_counter: Optional[int] = None):
+                 force_resume: bool = False, target_counter: Optional[int] = None,
+                 use_opencl: bool = False):
         self.game = game
         self.device_manager = device_manager
         self.macro_executor = MacroExecutor(speed_multiplier, inter_macro_delay, verbose)
-        self.image_detector = ImageDetector()
+        self.image_detector = ImageDetector(use_opencl=use_opencl)
         self.discord_notifier = DiscordNotifier(game.get_discord_webhook())
         self.max_instances = max_instances
         self.verbose = verbose
@@ -1820,7 +1901,7 @@ class AutomationEngine:
         # Initialize stream manager if streaming is enabled
         self.stream_manager = None
         if self.use_streaming:
-            self.stream_manager = MinicapStreamManager()
+            self.stream_manager = MinicapStreamManager(verbose=verbose)
             print("🎥 Streaming mode enabled - using real-time frames for automation")
         
         if self.verbose:
@@ -2228,6 +2309,10 @@ class AutomationEngine:
                             instance.running = False
                         break
                 
+                # Show streaming windows; OpenCV GUI calls must stay on this thread
+                if self.stream_manager:
+                    self.stream_manager.pump_display()
+                
                 # time.sleep(0.5)
                 
         except KeyboardInterrupt:
@@ -93,10 +93,19 @@ class DeviceManager:
             print(f"❌ Error getting screenshot for {device_id}: {e}")
             return None
     
-    def get_screenshot_as_image(self, device_id: str):
+    def get_screenshot_as_image(self, device_id: str, save_to_file: bool = False):
         """Get screenshot as OpenCV image array"""
-        screencap_manager = self._get_screencap_manager(device_id)
-        return screencap_manager.get_screenshot_as_image(device_id)
+        try:
+            screencap_manager = self._get_screencap_manager(device_id)
+            screenshot = screencap_manager.get_screenshot_as_image(device_id, save_to_file)
+            
+            if screenshot is None:
+                print(f"❌ Failed to get screenshot from device {device_id}")
+            return screenshot
+                
+        except Exception as e:
+            print(f"❌ Error getting screenshot for {device_id}: {e}")
+            return None
     
     def get_multiple_screenshots(self, device_id: str, count: int = 5, delay: float = 0.1) -> list[bytes]:
         """Get multiple screenshots with optional delay"""
@@ -5,39 +5,228 @@ Image Detection and Processing for automation
 import cv2
 import numpy as np
 import os
+import threading
+import weakref
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
 
 
+# Coarse-to-fine matching: candidates are found on a half-scale pyramid level and
+# only re-matched at full resolution inside their regions
+_PYRAMID_MIN_TEMPLATE_SIDE = 16  # Smaller templates lose too much detail at half scale
+_PYRAMID_THRESHOLD_MARGIN = 0.1  # Slack for noise on top of each template's measured coarse loss
+_PYRAMID_MAX_MARGIN = 0.3  # Beyond this the coarse pass rules out too little to be trusted or worth it
+_PYRAMID_TEMPLATE_BORDER = 1  # Half-scale template pixels dropped where pyrDown saw the padding
+_PYRAMID_ROI_PADDING = 4  # Full-resolution pixels added around each coarse candidate
+_PYRAMID_MAX_CANDIDATES = 16  # Beyond this a single full match is cheaper
+_PYRAMID_CLOSE_KERNEL = np.ones((3, 3), np.uint8)  # Square kernel merges neighbouring hits
+
+
+class _Template:
+    """A loaded template with everything about it that doesn't change between frames"""
+    
+    __slots__ = ('image', 'small', 'coarse_margin', 'flat', 'image_gpu', 'small_gpu')
+    
+    def __init__(self, image: np.ndarray, use_opencl: bool = False):
+        self.image = image
+        
+        self.small = None
+        self.coarse_margin = None
+        if min(image.shape[:2]) >= _PYRAMID_MIN_TEMPLATE_SIDE:
+            # The blur at the template's edge mixed in border padding rather than the
+            # screen content around it, so only the interior is comparable
+            border = _PYRAMID_TEMPLATE_BORDER
+            small = cv2.pyrDown(image)[border:-border, border:-border]
+            
+            # On screen the template can start at an odd pixel, where its half-scale level is
+            # sampled at another phase and the blur reaches one pixel of whatever surrounds
+            # it; the worst coarse score of an exact copy set in black or white at each phase
+            # is how far a true match can drop before the fine pass
+            worst = min(
+                cv2.minMaxLoc(cv2.matchTemplate(
+                    cv2.pyrDown(cv2.copyMakeBorder(image, 2 + dy, 2, 2 + dx, 2, cv2.BORDER_CONSTANT,
+                                                   value=(surround,) * 3)),
+                    small, cv2.TM_CCOEFF_NORMED))[1]
+                for dy in (0, 1) for dx in (0, 1) for surround in (0, 255)
+            )
+            margin = _PYRAMID_THRESHOLD_MARGIN + (1.0 - worst)
+            # High-frequency detail does not survive downscaling; such templates are
+            # always matched at full resolution
+            if margin <= _PYRAMID_MAX_MARGIN:
+                self.small = small
+                self.coarse_margin = margin
+        
+        # A single-color template has no variance to normalize by: TM_CCOEFF_NORMED
+        # scores it 1.0 everywhere, so it would "match" at the top-left of any frame
+        _, stddev = cv2.meanStdDev(image)
+        self.flat = not stddev.any()
+        
+        # Uploaded once so OpenCL matching only transfers the screenshot per frame
+        self.image_gpu = cv2.UMat(image) if use_opencl else None
+        self.small_gpu = cv2.UMat(self.small) if use_opencl and self.small is not None else None
+
+
 class ImageDetector:
     """Handles image detection, template matching, and image processing"""
     
-    def __init__(self):
+    def __init__(self, use_opencl: bool = False):
         self.project_root = Path(__file__).parent.parent
+        # Full-frame and coarse matching through OpenCV's T-API (OpenCL) when a device exists
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        elif use_opencl:
+            print("⚠️ OpenCL is not available, template matching will run on the CPU")
         # Store detected template coordinates
         self.detected_coordinates = {}
         # Cache for template paths to avoid repeated file system operations
         self.template_path_cache = {}
+        # Loaded templates with their pyramid level and statistics, keyed by path
+        self._templates = {}
+        # Per-frame work shared by every template matched against the same frame. One
+        # detector serves every device thread, so each thread keeps its own last frame
+        # rather than evicting the others'. Frames are identified by their ndarray
+        # object, so capture code must hand out a new object per frame, never refill
+        # and return the same array. Attributes, once set:
+        #   pyramid - (weakref to screenshot, half-scale level)
+        #   upload  - (weakref to screenshot, UMat) for OpenCL full-frame matching
+        self._frame_cache = threading.local()
+    
+    def _screenshot_half_scale(self, screenshot: np.ndarray) -> np.ndarray:
+        """Get the screenshot's half-scale level, computing it once per frame"""
+        frame_cache = self._frame_cache
+        cached = getattr(frame_cache, 'pyramid', None)
+        if cached is not None and cached[0]() is screenshot:
+            return cached[1]
+        
+        screenshot_small = cv2.pyrDown(screenshot)
+        if self.use_opencl:
+            screenshot_small = cv2.UMat(screenshot_small)
+        frame_cache.pyramid = (weakref.ref(screenshot), screenshot_small)
+        return screenshot_small
+    
+    def _screenshot_gpu(self, screenshot: np.ndarray) -> cv2.UMat:
+        """Get the screenshot uploaded for OpenCL, transferring it once per frame"""
+        frame_cache = self._frame_cache
+        cached = getattr(frame_cache, 'upload', None)
+        if cached is not None and cached[0]() is screenshot:
+            return cached[1]
+        
+        screenshot_gpu = cv2.UMat(screenshot)
+        frame_cache.upload = (weakref.ref(screenshot), screenshot_gpu)
+        return screenshot_gpu
+    
+    def _match_full(self, screenshot: np.ndarray, loaded: _Template) -> Tuple[float, Tuple[int, int]]:
+        """Match the template against the whole screenshot"""
+        if loaded.image_gpu is not None:
+            result = cv2.matchTemplate(self._screenshot_gpu(screenshot), loaded.image_gpu, cv2.TM_CCOEFF_NORMED)
+        else:
+            result = cv2.matchTemplate(screenshot, loaded.image, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+    
+    def _load_template(self, template_path: str) -> Optional[_Template]:
+        """Load a template once, precomputing its pyramid level and statistics"""
+        template_path = str(template_path)
+        if template_path in self._templates:
+            return self._templates[template_path]
+        
+        image = cv2.imread(template_path, cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+        
+        loaded = self._templates[template_path] = _Template(image, self.use_opencl)
+        if loaded.flat:
+            print(f"⚠️ Template is a single color and can never be located: {template_path}")
+        return loaded
+    
+    def _match_template(self, screenshot: np.ndarray, loaded: _Template,
+                        threshold: float) -> Tuple[float, Tuple[int, int]]:
+        """Find the best TM_CCOEFF_NORMED match, returning (score, top-left location)
+        
+        When the template is large enough and keeps its detail at half scale,
+        candidates are located on the half-scale pyramid level first; matches whose
+        coarse score falls below threshold minus the template's measured margin are
+        ruled out, and only the surviving regions are matched at full resolution. Scores of ruled-out matches, and of single-color templates,
+        are reported as -1.
+        """
+        if loaded.flat:
+            return -1.0, (0, 0)
+        
+        template, template_small = loaded.image, loaded.small
+        screen_h, screen_w = screenshot.shape[:2]
+        template_h, template_w = template.shape[:2]
+        
+        if template_small is None or screen_h < template_h * 2 or screen_w < template_w * 2:
+            return self._match_full(screenshot, loaded)
+        
+        # Coarse pass on the half-scale level
+        screenshot_small = self._screenshot_half_scale(screenshot)
+        if loaded.small_gpu is not None:
+            coarse = cv2.matchTemplate(screenshot_small, loaded.small_gpu, cv2.TM_CCOEFF_NORMED).get()
+        else:
+            coarse = cv2.matchTemplate(screenshot_small, template_small, cv2.TM_CCOEFF_NORMED)
+        mask = (coarse >= threshold - loaded.coarse_margin).astype(np.uint8)
+        if not mask.any():
+            return -1.0, (0, 0)
+        
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _PYRAMID_CLOSE_KERNEL)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        if count - 1 > _PYRAMID_MAX_CANDIDATES:
+            return self._match_full(screenshot, loaded)
+        
+        # Fine pass at full resolution, only around each coarse candidate (small
+        # regions, so these stay on the CPU)
+        best_val, best_loc = -1.0, (0, 0)
+        for x, y, w, h, _ in stats[1:]:
+            # Coarse hits locate the cropped interior; map back to the full template
+            x, y = x - _PYRAMID_TEMPLATE_BORDER, y - _PYRAMID_TEMPLATE_BORDER
+            x0 = max(0, 2 * x - _PYRAMID_ROI_PADDING)
+            y0 = max(0, 2 * y - _PYRAMID_ROI_PADDING)
+            x1 = min(screen_w, 2 * (x + w) + _PYRAMID_ROI_PADDING + template_w)
+            y1 = min(screen_h, 2 * (y + h) + _PYRAMID_ROI_PADDING + template_h)
+            if x1 - x0 < template_w or y1 - y0 < template_h:
+                continue
+            
+            result = cv2.matchTemplate(screenshot[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val > best_val:
+                best_val, best_loc = max_val, (x0 + max_loc[0], y0 + max_loc[1])
+        
+        return best_val, best_loc
     
     def detect_template(self, screenshot: np.ndarray, template_path: str, 
-                       threshold: float = 0.8) -> bool:
-        """Detect if a template image is present in the screenshot"""
+                       threshold: float = 0.8,
+                       roi: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """Detect if a template image is present in the screenshot
+        
+        With roi=(x1, y1, x2, y2) only that region of the screenshot is searched;
+        saved coordinates are still relative to the whole screenshot.
+        """
         try:
             # Load template image
-            template = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
-            if template is None:
+            loaded = self._load_template(template_path)
+            if loaded is None:
                 print(f"❌ Could not load template: {template_path}")
                 return False
+            template = loaded.image
+            
+            origin_x = origin_y = 0
+            if roi is not None:
+                origin_x, origin_y, x2, y2 = roi
+                screenshot = screenshot[origin_y:y2, origin_x:x2]
+                h, w = template.shape[:2]
+                if screenshot.shape[0] < h or screenshot.shape[1] < w:
+                    return False
             
             # Perform template matching
-            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            max_val, max_loc = self._match_template(screenshot, loaded, threshold)
             
             if max_val >= threshold:
                 # Save center coordinates of detected template
                 h, w = template.shape[:2]
-                center_x = max_loc[0] + w // 2
-                center_y = max_loc[1] + h // 2
+                center_x = origin_x + max_loc[0] + w // 2
+                center_y = origin_y + max_loc[1] + h // 2
                 
                 # Store coordinates with template name as key
                 template_name = Path(template_path).stem
@@ -55,12 +244,12 @@ class ImageDetector:
                                 threshold: float = 0.8) -> Optional[Tuple[int, int, int, int]]:
         """Detect template location and return bounding box (x, y, width, height)"""
         try:
-            template = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
-            if template is None:
+            loaded = self._load_template(template_path)
+            if loaded is None:
                 return None
+            template = loaded.image
             
-            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            max_val, max_loc = self._match_template(screenshot, loaded, threshold)
             
             if max_val >= threshold:
                 h, w = template.shape[:2]
@@ -208,15 +397,16 @@ class ImageDetector:
         return None
     
     def detect_game_template(self, screenshot: np.ndarray, game_name: str, 
-                           template_name: str, threshold: float = 0.8) -> bool:
-        """Detect a game-specific template in screenshot"""
+                           template_name: str, threshold: float = 0.8,
+                           roi: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """Detect a game-specific template in screenshot, optionally only within roi"""
         template_path = self.get_template_path(game_name, template_name)
         
         if template_path is None:
             print(f"❌ Template '{template_name}' not found for game '{game_name}'")
             return False
         
-        return self.detect_template(screenshot, str(template_path), threshold)
+        return self.detect_template(screenshot, str(template_path), threshold, roi)
     
     def list_available_templates(self, game_name: str) -> List[str]:
         """List all available templates for a game"""
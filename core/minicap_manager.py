@@ -6,6 +6,7 @@ using the standard Android screencap command instead of minicap.
 """
 
 import subprocess
+import threading
 import time
 import cv2
 import numpy as np
@@ -23,6 +24,9 @@ class ScreencapManager:
         self.session_active = {}
         self.session_stats = {}
         self._minicap_ready_devices = set()
+        # One minicap capture per device at a time (a background prefetch and a
+        # direct capture may otherwise run two minicap processes on the device)
+        self._capture_locks = {}
     
     def get_device_info(self, device_id: str) -> Optional[dict]:
         """Get device screen dimensions and density"""
@@ -149,8 +153,21 @@ class ScreencapManager:
         except Exception as e:
             print(f"❌ Error ending session for {device_id}: {e}")
     
-    def get_screenshot(self, device_id: str, save_to_file: bool = False) -> Optional[bytes]:
-        """Get screenshot using minicap via adb exec-out (single frame)"""
+    def _capture(self, device_id: str, save_to_file: bool = False) -> Optional[Tuple[bytes, np.ndarray]]:
+        """Capture a single minicap frame, returning (JPEG bytes, decoded BGR image)
+        
+        The frame has to be decoded to validate it anyway, so the image is returned
+        alongside the bytes for callers that need it. Captures for the same device
+        are serialized.
+        """
+        lock = self._capture_locks.get(device_id)
+        if lock is None:
+            lock = self._capture_locks.setdefault(device_id, threading.Lock())
+        with lock:
+            return self._capture_frame(device_id, save_to_file)
+    
+    def _capture_frame(self, device_id: str, save_to_file: bool = False) -> Optional[Tuple[bytes, np.ndarray]]:
+        """Run minicap once for a frame; callers hold the device's capture lock"""
         import time
         start_time = time.time()
         
@@ -219,7 +236,7 @@ class ScreencapManager:
                 print(f"📸 Minicap screenshot for {device_id}: {w}x{h} in {elapsed:.1f}ms")
                 if save_to_file:
                     self._save_screenshot(device_id, jpg_bytes)
-                return jpg_bytes
+                return jpg_bytes, img
             else:
                 err = result.stderr.decode(errors='ignore') if result.stderr else 'unknown error'
                 print(f"❌ Minicap exec-out failed for {device_id} (took {elapsed:.1f}ms): {err}")
@@ -229,6 +246,11 @@ class ScreencapManager:
             print(f"❌ Error getting minicap screenshot for {device_id} (took {elapsed:.1f}ms): {e}")
             return None
     
+    def get_screenshot(self, device_id: str, save_to_file: bool = False) -> Optional[bytes]:
+        """Get screenshot using minicap via adb exec-out (single frame)"""
+        captured = self._capture(device_id, save_to_file)
+        return captured[0] if captured else None
+    
     def get_session_screenshot(self, device_id: str, save_to_file: bool = False) -> Optional[bytes]:
         """Get screenshot from active session (optimized for multiple captures)"""
         # Ensure session is active
@@ -238,13 +260,10 @@ class ScreencapManager:
         
         return self.get_screenshot(device_id, save_to_file)
     
-    def get_screenshot_as_image(self, device_id: str) -> Optional[np.ndarray]:
-        """Get screenshot as OpenCV image array"""
-        screenshot_data = self.get_screenshot(device_id)
-        if screenshot_data:
-            image_array = np.frombuffer(screenshot_data, dtype=np.uint8)
-            return cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-        return None
+    def get_screenshot_as_image(self, device_id: str, save_to_file: bool = False) -> Optional[np.ndarray]:
+        """Get screenshot as OpenCV image array, reusing the decode done for validation"""
+        captured = self._capture(device_id, save_to_file)
+        return captured[1] if captured else None
     
     def get_multiple_screenshots(self, device_id: str, count: int = 5, delay: float = 0.1) -> list[bytes]:
         """Get multiple screenshots with optional delay"""
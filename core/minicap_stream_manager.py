@@ -7,49 +7,268 @@ import time
 import os
 import socket
 import threading
+import queue
+import selectors
 import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from pathlib import Path
 
 
+# Minicap protocol: [version(1), header_size(1), pid(4), real_width(4), real_height(4),
+# virtual_width(4), virtual_height(4), orientation(1), quirk(1)], then a 4-byte size per frame
+_BANNER = struct.Struct('<BBIIIIIBB')
+_FRAME_SIZE = struct.Struct('<I')
+
+# Widest frame shown in a stream window
+_DISPLAY_WIDTH = 800
+
+# Device name label drawn on stream windows
+_OVERLAY_ORIGIN = (10, 30)
+_OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_OVERLAY_SCALE = 0.7
+_OVERLAY_COLOR = (0, 255, 0)
+_OVERLAY_THICKNESS = 2
+
+# libjpeg can decode at 1/2, 1/4 and 1/8 scale in the DCT domain
+_REDUCED_DECODE_FLAGS = (
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+)
+
+
+def _display_decode_flags(width: int) -> int:
+    """Pick the cheapest JPEG decode that still fills the display width
+    
+    The largest reduction whose output is at least _DISPLAY_WIDTH wide wins, so the
+    preview is only ever resized down, never upscaled.
+    """
+    chosen = cv2.IMREAD_COLOR
+    for factor, flags in _REDUCED_DECODE_FLAGS:
+        if width // factor < _DISPLAY_WIDTH:
+            break
+        chosen = flags
+    return chosen
+
+# Block in a single recv until the whole requested count has arrived (not available everywhere)
+_MSG_WAITALL = getattr(socket, 'MSG_WAITALL', 0)
+
+
+def _set_recv_timeout(sock: socket.socket, seconds: float):
+    """Set a kernel-level receive timeout on a blocking socket"""
+    if os.name == 'nt':
+        value = struct.pack('<L', int(seconds * 1000))
+    else:
+        value = struct.pack('ll', int(seconds), int((seconds % 1) * 1000000))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, value)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Receive exactly size bytes, returning None if the peer closes the connection"""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received, _MSG_WAITALL)
+        if not count:
+            return None
+        received += count
+    return buf
+
+
+def _make_frame_reader(sock: socket.socket):
+    """Build a frame reader bound to one connected minicap socket
+    
+    Everything the per-frame path touches is resolved once here, so each call
+    only reads locals from its closure. Each frame gets a fresh buffer because
+    frames are published to consumers and must not be overwritten.
+    """
+    recv_into = sock.recv_into
+    unpack_size = _FRAME_SIZE.unpack_from
+    header_size = _FRAME_SIZE.size
+    header = bytearray(header_size)
+    header_view = memoryview(header)
+    waitall = _MSG_WAITALL
+    
+    def read_frame() -> Optional[bytearray]:
+        received = 0
+        while received < header_size:
+            count = recv_into(header_view[received:], header_size - received, waitall)
+            if not count:
+                return None
+            received += count
+        
+        frame_size = unpack_size(header)[0]
+        frame_data = bytearray(frame_size)
+        view = memoryview(frame_data)
+        received = 0
+        while received < frame_size:
+            count = recv_into(view[received:], frame_size - received, waitall)
+            if not count:
+                return None
+            received += count
+        return frame_data
+    
+    return read_frame
+
+
+class _FrameAssembler:
+    """Reassembles minicap frames from a non-blocking socket as their bytes arrive
+    
+    Each frame gets a fresh buffer because frames are published to consumers
+    and must not be overwritten.
+    """
+    
+    __slots__ = ('sock', 'header', 'frame', 'view', 'received')
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.header = bytearray(_FRAME_SIZE.size)
+        self.frame = None  # Payload buffer once the size header is complete
+        self.view = memoryview(self.header)  # Whichever of the two is being filled
+        self.received = 0
+    
+    def read(self) -> Optional[bytearray]:
+        """Read whatever the socket has buffered and return a frame once one is complete
+        
+        Returns None when the rest of the frame has not arrived yet; raises
+        EOFError when minicap closes the stream.
+        """
+        recv_into = self.sock.recv_into
+        while True:
+            remaining = len(self.view) - self.received
+            if remaining:
+                try:
+                    count = recv_into(self.view[self.received:], remaining)
+                except BlockingIOError:
+                    return None
+                if not count:
+                    raise EOFError("minicap closed the stream")
+                self.received += count
+                if count < remaining:
+                    continue
+            
+            if self.frame is None:
+                # Size header complete; start on the payload
+                self.frame = bytearray(_FRAME_SIZE.unpack_from(self.header)[0])
+                self.view = memoryview(self.frame)
+                self.received = 0
+                continue
+            
+            frame_data = self.frame
+            self.frame = None
+            self.view = memoryview(self.header)
+            self.received = 0
+            return frame_data
+
+
+class _Display:
+    """Display pipeline state for one streamed device"""
+    
+    __slots__ = ('name', 'flags', 'full_decode', 'bufs', 'ready', 'shown', 'closed', 'lock', 'busy',
+                 'pending', 'next_deadline', 'frame_count', 'overlay', 'overlay_mask')
+    
+    def __init__(self, name: str, width: int):
+        self.name = name
+        # The label never changes, so lay out its glyphs once and only blit them per frame
+        (text_width, _), baseline = cv2.getTextSize(name, _OVERLAY_FONT, _OVERLAY_SCALE, _OVERLAY_THICKNESS)
+        x, y = _OVERLAY_ORIGIN
+        self.overlay = np.zeros((y + baseline + _OVERLAY_THICKNESS, x + text_width + _OVERLAY_THICKNESS, 3), np.uint8)
+        cv2.putText(self.overlay, name, _OVERLAY_ORIGIN, _OVERLAY_FONT, _OVERLAY_SCALE,
+                    _OVERLAY_COLOR, _OVERLAY_THICKNESS)
+        self.overlay_mask = self.overlay.any(axis=2, keepdims=True)
+        # Decode straight to display size; full resolution is decoded on demand by get_latest_frame
+        self.flags = _display_decode_flags(width)
+        self.full_decode = self.flags == cv2.IMREAD_COLOR
+        # Triple buffering: at any time one buffer may be waiting to be shown and one may be
+        # on screen, so the render (only one per device at a time) always has a third to write
+        self.bufs = [None, None, None]
+        self.ready = None  # Frame waiting for the GUI thread (guarded by lock)
+        self.shown = None  # Frame the GUI thread last took to show (guarded by lock)
+        self.closed = False  # Window should be closed on the next pump
+        self.lock = threading.Lock()
+        self.busy = False  # A render for this device is queued or running
+        self.pending = None  # Newest (timestamp, JPEG) that arrived while busy
+        self.next_deadline = 0.0
+        self.frame_count = 0
+
+
+class _Stream:
+    """Per-device stream state; slots keep hot-path attribute access cheap"""
+    
+    __slots__ = ('port', 'process', 'width', 'height', 'running', 'sock', 'read', 'assembler',
+                 'connecting', 'latest', 'decoded', 'frame_ready', 'display', 'failures', 'retry_at')
+    
+    def __init__(self, port: int, process: subprocess.Popen, width: int, height: int):
+        self.port = port
+        self.process = process
+        self.width = width
+        self.height = height
+        self.running = True
+        self.sock = None  # Will be created on first frame read
+        self.read = None  # Frame reader built for sock once the banner is read
+        self.assembler = None  # _FrameAssembler while the I/O thread owns sock
+        self.connecting = False  # A connect is running on the connect pool
+        # Latest-value channel: the reader replaces `latest` (a single atomic store under
+        # the GIL) and consumers read it without copies or locks
+        self.latest = None  # Last JPEG-encoded frame
+        self.decoded = None  # (JPEG bytes, decoded frame) for the last decoded frame
+        self.frame_ready = threading.Event()  # Set whenever a new frame is published
+        self.display = None  # _Display once a stream window is requested
+        self.failures = 0  # Consecutive connect/read failures
+        self.retry_at = 0.0  # Monotonic time before which no reconnect is attempted
+
+
 class MinicapStreamManager:
     """Manages minicap streaming for real-time screen capture with OpenCV display"""
     
-    def __init__(self, minicap_path: str = "minicap"):
+    def __init__(self, minicap_path: str = "minicap", verbose: bool = False):
         self.minicap_path = minicap_path
+        self.verbose = verbose
         self.device_info = {}
-        self.streaming_devices = {}  # device_id -> stream info
+        self.streaming_devices = {}  # device_id -> _Stream
         self.base_port = 1313  # Base port for minicap
         self.port_offset = 0  # Offset for multiple devices
-        self.last_frames = {}  # device_id -> last frame
+        self.display_frames = {}  # device_id -> _Display with a frame to show or a window to close
+        self._stop_event = threading.Event()  # Set by stop_all_streaming to stop the I/O thread
+        self._display_closed = threading.Event()  # Set when ESC closes the windows; streams keep running
+        self.display_fps = 30
+        self.max_failures = 10  # Max consecutive failures before giving up on a device
+        self._io_thread = None  # Single thread draining every device socket
+        self._new_streams = queue.SimpleQueue()  # device_ids waiting to join the I/O thread
+        self._connected_streams = queue.SimpleQueue()  # (device_id, socket or None) from connect workers
+        self._connect_pool = None  # Connects and banner reads, kept off the I/O thread
+        self._decode_pool = None  # Shared pool for display decodes
+        self.frame_latencies = deque(maxlen=256)  # recent (device_id, latency_ms) samples
+        self.log_interval = 30  # Frames between verbose per-device log lines
         # Removed frame_locks for simplicity
         
     def get_device_info(self, device_id: str) -> Optional[dict]:
         """Get device screen dimensions and density"""
         try:
-            # Get screen dimensions
+            # Get screen dimensions and density in a single adb round trip
             result = subprocess.run([
-                'adb', '-s', device_id, 'shell', 'wm', 'size'
-            ], capture_output=True, timeout=5)
+                'adb', '-s', device_id, 'shell', 'wm size; wm density'
+            ], capture_output=True, text=True, timeout=5)
             
-            if result.returncode != 0:
+            lines = result.stdout.strip().splitlines()
+            # An override line, when present, comes after the physical one
+            size_lines = [line for line in lines if 'size' in line]
+            density_lines = [line for line in lines if 'density' in line]
+            
+            if not size_lines:
                 return None
                 
-            size_output = result.stdout.decode().strip()
-            width, height = map(int, size_output.split()[-1].split('x'))
+            width, height = map(int, size_lines[-1].split()[-1].split('x'))
             
-            # Get screen density
-            result = subprocess.run([
-                'adb', '-s', device_id, 'shell', 'wm', 'density'
-            ], capture_output=True, timeout=5)
-            
-            if result.returncode != 0:
+            if not density_lines:
                 density = 420  # Default density
             else:
-                density_output = result.stdout.decode().strip()
-                density = int(density_output.split()[-1])
+                density = int(density_lines[-1].split()[-1])
             
             return {
                 'width': width,
@@ -80,31 +299,20 @@ class MinicapStreamManager:
                 print(f"❌ Minicap files not found in {self.minicap_path}")
                 return False
             
-            # Push files to device
+            # Push both files to device in one adb invocation
             result = subprocess.run([
-                'adb', '-s', device_id, 'push', str(minicap_binary), '/data/local/tmp/'
-            ], capture_output=True, timeout=10)
+                'adb', '-s', device_id, 'push', str(minicap_binary), str(minicap_so), '/data/local/tmp/'
+            ], capture_output=True, text=True, timeout=20)
             
             if result.returncode != 0:
-                print(f"❌ Failed to push minicap binary: {result.stderr.decode()}")
-                return False
-            
-            result = subprocess.run([
-                'adb', '-s', device_id, 'push', str(minicap_so), '/data/local/tmp/'
-            ], capture_output=True, timeout=10)
-            
-            if result.returncode != 0:
-                print(f"❌ Failed to push minicap.so: {result.stderr.decode()}")
+                print(f"❌ Failed to push minicap files: {result.stderr}")
                 return False
             
             # Set permissions
             subprocess.run([
-                'adb', '-s', device_id, 'shell', 'chmod', '777', '/data/local/tmp/minicap'
-            ], capture_output=True, timeout=5)
-            
-            subprocess.run([
-                'adb', '-s', device_id, 'shell', 'chmod', '777', '/data/local/tmp/minicap.so'
-            ], capture_output=True, timeout=5)
+                'adb', '-s', device_id, 'shell',
+                'chmod 777 /data/local/tmp/minicap /data/local/tmp/minicap.so'
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
             
             print(f"✅ Minicap setup completed for {device_id}")
             return True
@@ -125,292 +333,554 @@ class MinicapStreamManager:
                 port = self.base_port + self.port_offset
                 self.port_offset += 1
             
-            # Kill any existing minicap processes
-            subprocess.run([
-                'adb', '-s', device_id, 'shell', 'pkill', '-f', 'minicap'
-            ], capture_output=True, timeout=5)
-            
-            time.sleep(1)
-            
-            # Remove existing port forwarding
-            subprocess.run([
-                'adb', '-s', device_id, 'forward', '--remove', f'tcp:{port}'
-            ], capture_output=True, timeout=5)
-            
             # Start minicap with device dimensions
             width = self.device_info[device_id]['width']
             height = self.device_info[device_id]['height']
             
-            # Start minicap in background with LD_LIBRARY_PATH set
-            minicap_cmd = f'LD_LIBRARY_PATH=/data/local/tmp /data/local/tmp/minicap -P {width}x{height}@{width}x{height}/0'
+            # Kill any existing minicap (matched by exact name so the shell itself survives),
+            # wait for it to exit, then start minicap with LD_LIBRARY_PATH set - all in one adb shell
+            minicap_cmd = (
+                'pkill -x minicap; '
+                'while pidof minicap >/dev/null; do sleep 0.05; done; '
+                f'LD_LIBRARY_PATH=/data/local/tmp exec /data/local/tmp/minicap -P {width}x{height}@{width}x{height}/0'
+            )
             
             # Start minicap process
             process = subprocess.Popen([
                 'adb', '-s', device_id, 'shell', minicap_cmd
             ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             
-            # Wait a moment for minicap to start
-            time.sleep(2)
-            
-            # Check if minicap is running
-            result = subprocess.run([
-                'adb', '-s', device_id, 'shell', 'ps', '|', 'grep', 'minicap'
-            ], capture_output=True, timeout=5)
+            # Setup port forwarding (replaces any existing forward on this port)
+            subprocess.run([
+                'adb', '-s', device_id, 'forward', f'tcp:{port}', 'localabstract:minicap'
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
             
-            if result.returncode == 0 and 'minicap' in result.stdout.decode():
-                # Setup port forwarding
-                subprocess.run([
-                    'adb', '-s', device_id, 'forward', f'tcp:{port}', 'localabstract:minicap'
-                ], capture_output=True, timeout=5)
-                
-                # Test connection with retries
-                max_retries = 3
-                for retry in range(max_retries):
-                    try:
-                        # Test if we can connect to the socket
-                        test_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        test_sock.settimeout(2)
-                        test_sock.connect(('localhost', port))
-                        test_sock.close()
-                        break
-                    except Exception as e:
-                        if retry == max_retries - 1:
-                            print(f"❌ Failed to connect to minicap socket after {max_retries} retries")
-                            return False
-                        print(f"⚠️ Connection attempt {retry + 1} failed, retrying...")
-                        time.sleep(1)
-                
-                # Initialize frame storage
-                self.last_frames[device_id] = None
-                
-                # Store stream info
-                self.streaming_devices[device_id] = {
-                    'port': port,
-                    'process': process,
-                    'width': width,
-                    'height': height,
-                    'running': True,
-                    'socket': None,  # Will be created on first frame read
-                    'banner_read': False
-                }
-                
-                print(f"✅ Minicap streaming started for {device_id} on port {port}")
-                return True
-            else:
+            if not self._wait_for_minicap(process, port):
                 print(f"❌ Failed to start minicap for {device_id}")
+                process.terminate()
                 return False
+            
+            # Store stream info
+            self.streaming_devices[device_id] = _Stream(port, process, width, height)
+            
+            print(f"✅ Minicap streaming started for {device_id} on port {port}")
+            return True
                 
         except Exception as e:
             print(f"❌ Error starting minicap streaming for {device_id}: {e}")
             return False
     
+    def _wait_for_minicap(self, process: subprocess.Popen, port: int, timeout: float = 5.0) -> bool:
+        """Poll the forwarded port until minicap answers, backing off from 10ms to 250ms
+        
+        adb accepts the TCP connection even before minicap listens and then closes
+        it, so readiness means the banner's first byte can be peeked.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            if process.poll() is not None:
+                return False
+            
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(0.5)
+            try:
+                sock.connect(('localhost', port))
+                if sock.recv(1, socket.MSG_PEEK):
+                    return True
+            except OSError:
+                pass
+            finally:
+                sock.close()
+            
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+    
     def read_minicap_frame(self, device_id: str) -> Optional[np.ndarray]:
         """Read a single frame from minicap stream"""
+        frame_data = self._read_minicap_bytes(device_id)
+        if frame_data is None:
+            return None
+        return self._decode_frame(frame_data)
+    
+    def _decode_frame(self, frame_data: bytes, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+        """Decode a JPEG frame received from minicap"""
+        nparr = np.frombuffer(frame_data, np.uint8)
+        img = cv2.imdecode(nparr, flags)
+        if img is None:
+            print("❌ Failed to decode frame as image")
+        return img
+    
+    def _connect_stream(self, stream_info: _Stream) -> bool:
+        """Connect to a minicap stream and read its banner"""
+        sock = self._open_stream_socket(stream_info.port)
+        if sock is None:
+            return False
+        
+        stream_info.read = _make_frame_reader(sock)
+        stream_info.sock = sock
+        return True
+    
+    def _open_stream_socket(self, port: int) -> Optional[socket.socket]:
+        """Open a blocking socket to a minicap port, positioned just past the banner"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(2)
         try:
-            if device_id not in self.streaming_devices:
-                return None
-            
-            stream_info = self.streaming_devices[device_id]
-            port = stream_info['port']
-            
-            # Create or reuse socket connection
-            if stream_info['socket'] is None:
-                # Create new connection
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                try:
-                    sock.connect(('localhost', port))
-                    stream_info['socket'] = sock
-                    stream_info['banner_read'] = False
-                except Exception as e:
-                    sock.close()
-                    return None
-            else:
-                sock = stream_info['socket']
-            
-            # Read banner only once
-            if not stream_info['banner_read']:
-                # Read banner (24 bytes) - minicap protocol
-                banner = b''
-                while len(banner) < 24:
-                    chunk = sock.recv(24 - len(banner))
-                    if not chunk:
-                        sock.close()
-                        stream_info['socket'] = None
-                        return None
-                    banner += chunk
-                
-                if len(banner) != 24:
-                    sock.close()
-                    return None
-                
-                # Parse banner according to minicap protocol
-                # Format: [version(1), header_size(1), pid(4), real_width(4), real_height(4), virtual_width(4), virtual_height(4), orientation(1), quirk(1)]
-                try:
-                    version = banner[0]
-                    header_size = banner[1]  # This is 1 byte, not 4 bytes
-                    pid = struct.unpack('<I', banner[2:6])[0]  # Bytes 2-5
-                    real_width = struct.unpack('<I', banner[6:10])[0]  # Bytes 6-9
-                    real_height = struct.unpack('<I', banner[10:14])[0]  # Bytes 10-13
-                    virtual_width = struct.unpack('<I', banner[14:18])[0]  # Bytes 14-17
-                    virtual_height = struct.unpack('<I', banner[18:22])[0]  # Bytes 18-21
-                    orientation = banner[22]  # Byte 22
-                    quirk = banner[23]  # Byte 23
-                    
-                    stream_info['banner_read'] = True
-                    
-                except Exception as e:
-                    print(f"❌ Error parsing banner: {e}")
-                    sock.close()
-                    stream_info['socket'] = None
-                    return None
-            
-            # Read frame size (4 bytes)
-            frame_size_data = b''
-            while len(frame_size_data) < 4:
-                chunk = sock.recv(4 - len(frame_size_data))
-                if not chunk:
-                    sock.close()
-                    stream_info['socket'] = None
-                    return None
-                frame_size_data += chunk
-            
-            if len(frame_size_data) != 4:
-                print(f"❌ Incomplete frame size data: {len(frame_size_data)} bytes")
+            sock.connect(('localhost', port))
+            # Blocking mode so MSG_WAITALL can fill a read in one syscall;
+            # SO_RCVTIMEO keeps the previous 2s read timeout
+            sock.settimeout(None)
+            _set_recv_timeout(sock, 2)
+            
+            # Read banner (24 bytes) - minicap protocol
+            banner = _recv_exactly(sock, _BANNER.size)
+            if banner is None:
                 sock.close()
-                stream_info['socket'] = None
                 return None
             
+            # Parse banner according to minicap protocol
+            (version, header_size, pid, real_width, real_height,
+             virtual_width, virtual_height, orientation, quirk) = _BANNER.unpack_from(banner)
+            
+        except Exception as e:
+            sock.close()
+            return None
+        
+        return sock
+    
+    def _close_stream_socket(self, stream_info: _Stream):
+        """Close a stream's socket so the next read reconnects"""
+        sock = stream_info.sock
+        stream_info.sock = None
+        stream_info.read = None
+        if sock is not None:
             try:
-                frame_size = struct.unpack('<I', frame_size_data)[0]
-            except Exception as e:
-                print(f"❌ Error parsing frame size: {e}")
                 sock.close()
-                stream_info['socket'] = None
+            except:
+                pass
+    
+    def _read_minicap_bytes(self, device_id: str) -> Optional[bytearray]:
+        """Read a single JPEG-encoded frame from minicap stream without decoding it"""
+        stream_info = self.streaming_devices.get(device_id)
+        if stream_info is None:
+            return None
+        
+        if stream_info.display is not None:
+            # The I/O thread owns this stream's socket; hand back its newest frame
+            return stream_info.latest
+        
+        try:
+            # Create or reuse socket connection
+            if stream_info.sock is None and not self._connect_stream(stream_info):
                 return None
             
-            # Read frame data
-            frame_data = b''
-            while len(frame_data) < frame_size:
-                chunk = sock.recv(min(frame_size - len(frame_data), 4096))  # Read in chunks
-                if not chunk:
-                    break
-                frame_data += chunk
-            
-            if len(frame_data) == frame_size:
-                # Convert to OpenCV image
-                nparr = np.frombuffer(frame_data, np.uint8)
-                img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                if img is not None:
-                    return img
-                else:
-                    print("❌ Failed to decode frame as image")
-                    return None
-            
-            return None
+            # Read frame size and data
+            frame_data = stream_info.read()
+            if frame_data is None:
+                self._close_stream_socket(stream_info)
+            return frame_data
             
         except Exception as e:
             print(f"❌ Error reading frame for {device_id}: {e}")
             # Reset socket on error
-            if device_id in self.streaming_devices:
-                try:
-                    self.streaming_devices[device_id]['socket'].close()
-                except:
-                    pass
-                self.streaming_devices[device_id]['socket'] = None
-                self.streaming_devices[device_id]['banner_read'] = False
+            self._close_stream_socket(stream_info)
             return None
     
-    def get_latest_frame(self, device_id: str) -> Optional[np.ndarray]:
-        """Get the latest frame for a device"""
-        import time
-        start_time = time.time()
+    def is_streaming(self, device_id: str) -> bool:
+        """Check whether a device stream is running"""
+        stream_info = self.streaming_devices.get(device_id)
+        return stream_info is not None and stream_info.running
+    
+    def get_latest_frame(self, device_id: str, decode: bool = True) -> Union[np.ndarray, bytearray, None]:
+        """Get the latest frame for a device
         
-        frame = self.last_frames.get(device_id)
+        Frames are kept JPEG-encoded and only decoded on request; the decoded
+        image is cached until a newer frame arrives. Pass decode=False to get
+        the raw JPEG bytes.
+        """
+        stream_info = self.streaming_devices.get(device_id)
+        frame_data = stream_info.latest if stream_info is not None else None
         
+        if frame_data is None:
+            if self.verbose:
+                print(f"⚠️ No frame available for {device_id}")
+            return None
+        
+        if not decode:
+            return frame_data
+        
+        cached = stream_info.decoded
+        if cached is not None and cached[0] is frame_data:
+            return cached[1]
+        
+        frame = self._decode_frame(frame_data)
         if frame is not None:
-            elapsed = (time.time() - start_time) * 1000  # Convert to milliseconds
-            print(f"📸 Retrieved frame for {device_id} in {elapsed:.1f}ms")
-        else:
-            elapsed = (time.time() - start_time) * 1000
-            print(f"⚠️ No frame available for {device_id} (took {elapsed:.1f}ms)")
-            
+            stream_info.decoded = (frame_data, frame)
         return frame
     
+    def wait_for_frame(self, device_id: str, timeout: float = None) -> bool:
+        """Block until a frame newer than the last wait is published for a device"""
+        stream_info = self.streaming_devices.get(device_id)
+        if stream_info is None:
+            return False
+        if not stream_info.frame_ready.wait(timeout):
+            return False
+        stream_info.frame_ready.clear()
+        return True
+    
+    def get_latest_roi(self, device_id: str, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
+        """Get a region of the latest frame for a device"""
+        frame = self.get_latest_frame(device_id)
+        if frame is None:
+            return None
+        return frame[y:y + height, x:x + width]
+    
+    def stats(self) -> Dict[str, dict]:
+        """Summarize recent frame latencies (capture to decode) per device"""
+        samples = {}
+        for device_id, latency_ms in list(self.frame_latencies):
+            samples.setdefault(device_id, []).append(latency_ms)
+        
+        return {
+            device_id: {
+                'frames': len(latencies),
+                'avg_latency_ms': sum(latencies) / len(latencies),
+                'max_latency_ms': max(latencies)
+            }
+            for device_id, latencies in samples.items()
+        }
+    
     def start_streaming_thread(self, device_id: str, display_name: str = None):
-        """Start streaming thread for a device with OpenCV display"""
+        """Start streaming a device with OpenCV display
+        
+        Every device socket is drained by one I/O thread multiplexed with
+        selectors, reading only what each socket has buffered; connects and
+        display decodes run on shared thread pools, so neither a slow device
+        nor a slow decode stalls the other sockets. Display frames are shown by pump_display
+        on the main thread, since OpenCV HighGUI is not thread-safe.
+        """
         if display_name is None:
             display_name = f"Device {device_id}"
         
-        def stream_loop():
-            print(f"🎥 Starting stream for {device_id} - {display_name}")
-            
-            consecutive_failures = 0
-            max_failures = 10  # Max consecutive failures before giving up
-            
-            while self.streaming_devices.get(device_id, {}).get('running', False):
-                try:
-                    frame_start_time = time.time()
-                    frame = self.read_minicap_frame(device_id)
-                    if frame is not None:
-                        consecutive_failures = 0  # Reset failure counter
-                        
-                        # Store the latest frame
-                        self.last_frames[device_id] = frame.copy()
-                        
-                        frame_elapsed = (time.time() - frame_start_time) * 1000
-                        print(f"💾 Stored frame for {device_id} in {frame_elapsed:.1f}ms")
-                        
-                        # Resize frame for display (optional)
-                        height, width = frame.shape[:2]
-                        if width > 800:  # Resize if too large
-                            scale = 800 / width
-                            new_width = int(width * scale)
-                            new_height = int(height * scale)
-                            frame = cv2.resize(frame, (new_width, new_height))
-                        
-                        # Add device info overlay
-                        cv2.putText(frame, f"{display_name}", (10, 30), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                        
-                        # Display frame
-                        cv2.imshow(display_name, frame)
-                        
-                        # Handle key press (ESC to exit)
-                        key = cv2.waitKey(1) & 0xFF
-                        if key == 27:  # ESC
-                            break
-                    else:
-                        consecutive_failures += 1
-                        if consecutive_failures >= max_failures:
-                            print(f"❌ Too many consecutive failures for {device_id}, stopping stream")
-                            break
-                        time.sleep(0.1)  # Short delay on failure
-                        continue
-                    
-                    # Maintain 30fps
-                    time.sleep(1/30)
-                    
-                except Exception as e:
-                    consecutive_failures += 1
-                    print(f"❌ Error in stream loop for {device_id}: {e}")
-                    if consecutive_failures >= max_failures:
-                        print(f"❌ Too many consecutive failures for {device_id}, stopping stream")
+        stream_info = self.streaming_devices.get(device_id)
+        if stream_info is None:
+            print(f"❌ Streaming has not been started for {device_id}")
+            return None
+        
+        stream_info.display = _Display(display_name, stream_info.width)
+        print(f"🎥 Starting stream for {device_id} - {display_name}")
+        
+        if self._io_thread is None or not self._io_thread.is_alive():
+            self._decode_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+            self._connect_pool = ThreadPoolExecutor(max_workers=4)
+            self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+            self._io_thread.start()
+        
+        self._display_closed.clear()
+        self._new_streams.put(device_id)
+        return self._io_thread
+    
+    def _io_loop(self):
+        """Drain every streaming device's socket from a single thread"""
+        selector = selectors.DefaultSelector()
+        streams = {}  # device_id -> _Stream owned by this loop
+        
+        try:
+            while not self._stop_event.is_set():
+                # Pick up newly started streams
+                while True:
+                    try:
+                        device_id = self._new_streams.get_nowait()
+                    except queue.Empty:
                         break
-                    time.sleep(1)
+                    stream_info = self.streaming_devices.get(device_id)
+                    if stream_info is not None:
+                        # A socket opened by read_minicap_frame may sit mid-frame;
+                        # reconnect so this loop starts from a fresh banner
+                        self._close_stream_socket(stream_info)
+                        streams[device_id] = stream_info
+                
+                # Register sockets the connect workers have finished opening
+                while True:
+                    try:
+                        device_id, sock = self._connected_streams.get_nowait()
+                    except queue.Empty:
+                        break
+                    stream_info = streams.get(device_id)
+                    if stream_info is not None:
+                        stream_info.connecting = False
+                    if sock is None:
+                        if stream_info is not None:
+                            self._record_failure(device_id, stream_info)
+                    elif stream_info is None or not stream_info.running:
+                        sock.close()
+                    else:
+                        sock.setblocking(False)
+                        stream_info.assembler = _FrameAssembler(sock)
+                        stream_info.sock = sock
+                        selector.register(sock, selectors.EVENT_READ, device_id)
+                
+                # Drop stopped streams and start reconnecting the others
+                now = time.monotonic()
+                for device_id, stream_info in list(streams.items()):
+                    if not stream_info.running:
+                        if not stream_info.connecting:
+                            self._release_stream(selector, device_id, stream_info)
+                            del streams[device_id]
+                    elif (stream_info.sock is None and not stream_info.connecting
+                          and now >= stream_info.retry_at):
+                        stream_info.connecting = True
+                        try:
+                            self._connect_pool.submit(self._connect_worker, device_id, stream_info)
+                        except RuntimeError:
+                            # Pool already shut down by stop_all_streaming
+                            stream_info.connecting = False
+                
+                if not selector.get_map():
+                    # select() on an empty set fails on Windows
+                    time.sleep(0.1)
+                    continue
+                
+                try:
+                    events = selector.select(timeout=0.1)
+                except OSError:
+                    # A socket was closed by stop_streaming; the sweep above unregisters it
+                    continue
+                
+                for key, _ in events:
+                    self._drain_one_frame(selector, key, streams[key.data])
+        finally:
+            for device_id, stream_info in streams.items():
+                self._release_stream(selector, device_id, stream_info)
+            selector.close()
+            # Close sockets whose connects finished after the loop stopped
+            while True:
+                try:
+                    _, sock = self._connected_streams.get_nowait()
+                except queue.Empty:
+                    break
+                if sock is not None:
+                    sock.close()
+    
+    def _connect_worker(self, device_id: str, stream_info: _Stream):
+        """Open a stream's socket on the connect pool and hand it to the I/O thread"""
+        sock = self._open_stream_socket(stream_info.port)
+        if sock is not None and not stream_info.running:
+            sock.close()
+            sock = None
+        self._connected_streams.put((device_id, sock))
+    
+    def _drain_one_frame(self, selector: selectors.BaseSelector, key: selectors.SelectorKey, stream_info: _Stream):
+        """Read what a readable socket has buffered and publish the frame once it is complete"""
+        device_id = key.data
+        failed = False
+        try:
+            frame_data = stream_info.assembler.read()
+        except EOFError:
+            failed = True
+        except Exception as e:
+            print(f"❌ Error reading frame for {device_id}: {e}")
+            failed = True
+        
+        if failed:
+            selector.unregister(key.fileobj)
+            self._close_stream_socket(stream_info)
+            self._record_failure(device_id, stream_info)
+            return
+        
+        if frame_data is None:
+            return  # Rest of the frame has not arrived yet
+        
+        stream_info.failures = 0  # Reset failure counter
+        # Publish the encoded frame; consumers decode it on demand
+        stream_info.latest = frame_data
+        stream_info.frame_ready.set()
+        
+        if stream_info.display is not None:
+            self._schedule_display(device_id, stream_info, frame_data)
+    
+    def _record_failure(self, device_id: str, stream_info: _Stream):
+        """Count a connect/read failure and give up on the device after too many"""
+        stream_info.failures += 1
+        if stream_info.failures >= self.max_failures:
+            print(f"❌ Too many consecutive failures for {device_id}, stopping stream")
+            stream_info.running = False
+        else:
+            stream_info.retry_at = time.monotonic() + 0.1  # Short delay on failure
+    
+    def _release_stream(self, selector: selectors.BaseSelector, device_id: str, stream_info: _Stream):
+        """Unregister a finished stream from the I/O thread and close its window"""
+        for key in list(selector.get_map().values()):
+            if key.data == device_id:
+                selector.unregister(key.fileobj)
+        self._close_stream_socket(stream_info)
+        
+        display = stream_info.display
+        if display is not None:
+            # Ask the GUI thread to close the window
+            display.closed = True
+            self.display_frames[device_id] = display
+        print(f"🎥 Stream ended for {device_id}")
+    
+    def _schedule_display(self, device_id: str, stream_info: _Stream, frame_data: bytearray):
+        """Queue a display render, paced to display_fps and one in flight per device"""
+        if self._display_closed.is_set():
+            return
+        display = stream_info.display
+        
+        # Pace against an absolute deadline so decode/display time is not added on top;
+        # frames in between are still published to get_latest_frame
+        now = time.monotonic()
+        if now < display.next_deadline:
+            return
+        frame_interval = 1 / self.display_fps
+        display.next_deadline += frame_interval
+        if display.next_deadline < now:
+            # Fell more than a frame behind; skip ahead instead of catching up
+            display.next_deadline = now + frame_interval
+        
+        item = (time.perf_counter(), frame_data)
+        with display.lock:
+            if display.busy:
+                # Replace whatever was waiting; only the newest frame is worth showing
+                display.pending = item
+                return
+            display.busy = True
+        
+        try:
+            self._decode_pool.submit(self._render_display, device_id, stream_info, item)
+        except RuntimeError:
+            # Pool already shut down by stop_all_streaming
+            display.busy = False
+    
+    def _render_display(self, device_id: str, stream_info: _Stream, item: tuple):
+        """Render display frames for a device until none are pending"""
+        display = stream_info.display
+        while item is not None:
+            try:
+                self._render_display_frame(device_id, stream_info, display, *item)
+            except Exception as e:
+                print(f"❌ Error in stream loop for {device_id}: {e}")
             
-            # Clean up window
+            with display.lock:
+                item = display.pending
+                display.pending = None
+                if item is None:
+                    display.busy = False
+    
+    def _render_display_frame(self, device_id: str, stream_info: _Stream, display: _Display,
+                              frame_time: float, frame_data: bytearray):
+        """Decode one frame at display size, draw the overlay and hand it to the GUI thread"""
+        frame = self._decode_frame(frame_data, display.flags)
+        if frame is None:
+            return
+        
+        if display.full_decode:
+            # Share the decode with get_latest_frame; imdecode returns a fresh array nobody else owns
+            stream_info.decoded = (frame_data, frame)
+        
+        display.frame_count += 1
+        frame_elapsed = (time.perf_counter() - frame_time) * 1000
+        self.frame_latencies.append((device_id, frame_elapsed))
+        if self.verbose and display.frame_count % self.log_interval == 0:
+            print(f"💾 Stored frame {display.frame_count} for {device_id} in {frame_elapsed:.1f}ms")
+        
+        # Resize frame for display if the reduced decode was not enough;
+        # the overlay must never touch a frame shared with get_latest_frame
+        height, width = frame.shape[:2]
+        if width > _DISPLAY_WIDTH:  # Resize if too large
+            scale = _DISPLAY_WIDTH / width
+            new_width = int(width * scale)
+            new_height = int(height * scale)
+            display_shape = (new_height, new_width, 3)
+        elif display.full_decode:
+            display_shape = frame.shape
+        else:
+            display_shape = None  # Reduced decode is already private to this render
+        
+        if display_shape is None:
+            display_frame = frame
+        else:
+            with display.lock:
+                # Neither the frame waiting to be shown nor the one on screen may be written
+                index = next(i for i, buf in enumerate(display.bufs)
+                             if buf is None or (buf is not display.ready and buf is not display.shown))
+            display_frame = display.bufs[index]
+            if display_frame is None or display_frame.shape != display_shape:
+                display_frame = display.bufs[index] = np.empty(display_shape, np.uint8)
+            
+            if width > _DISPLAY_WIDTH:
+                cv2.resize(frame, (new_width, new_height), dst=display_frame)
+            else:
+                np.copyto(display_frame, frame)
+        
+        # Add device info overlay
+        overlay = display.overlay
+        region = display_frame[:overlay.shape[0], :overlay.shape[1]]
+        if region.shape == overlay.shape:
+            np.copyto(region, overlay, where=display.overlay_mask)
+        else:
+            # Frame smaller than the pre-rendered label
+            cv2.putText(display_frame, display.name, _OVERLAY_ORIGIN, _OVERLAY_FONT, _OVERLAY_SCALE,
+                        _OVERLAY_COLOR, _OVERLAY_THICKNESS)
+        
+        # Hand the frame to the GUI thread
+        with display.lock:
+            display.ready = display_frame
+        self.display_frames[device_id] = display
+    
+    def pump_display(self) -> bool:
+        """Show pending display frames for all devices; must be called from the main thread
+        
+        Returns False once ESC has been pressed in any window. ESC only closes the
+        windows: streams keep publishing frames for get_latest_frame until
+        stop_all_streaming.
+        """
+        if self._display_closed.is_set():
+            return False
+        
+        for device_id in list(self.display_frames):
+            display = self.display_frames.pop(device_id, None)
+            if display is None:
+                continue
+            if display.closed:
+                try:
+                    cv2.destroyWindow(display.name)
+                except:
+                    pass
+                continue
+            
+            # Take the waiting frame; the render keeps off it until the next one is taken
+            with display.lock:
+                display_frame = display.ready
+                display.ready = None
+                if display_frame is not None:
+                    display.shown = display_frame
+            if display_frame is not None:
+                cv2.imshow(display.name, display_frame)
+        
+        # One waitKey per tick services every window
+        key = cv2.waitKey(1) & 0xFF
+        if key == 27:  # ESC
+            self._display_closed.set()
+            self.display_frames.clear()
             try:
-                cv2.destroyWindow(display_name)
+                cv2.destroyAllWindows()
             except:
                 pass
-            print(f"🎥 Stream ended for {device_id}")
-        
-        # Start streaming thread
-        stream_thread = threading.Thread(target=stream_loop, daemon=True)
-        stream_thread.start()
+            return False
         
-        return stream_thread
+        return not self._stop_event.is_set()
+    
+    def run_display_loop(self, fps: float = 30):
+        """Run the shared OpenCV GUI loop on the calling thread until ESC or all streams stop"""
+        interval = 1 / fps
+        while any(info.running for info in list(self.streaming_devices.values())):
+            if not self.pump_display():
+                break
+            time.sleep(interval)
     
     def start_multi_device_streaming(self, device_list: List[str]):
         """Start streaming for multiple devices with different ports"""
@@ -427,13 +897,13 @@ class MinicapStreamManager:
         print(f"✅ Streaming started for {len(device_list)} devices")
         print("Press ESC in any window to stop streaming")
         
-        # Wait for user to stop
+        # Show frames until the user stops
         try:
-            while any(info.get('running', False) for info in self.streaming_devices.values()):
-                time.sleep(0.1)
+            self.run_display_loop()
         except KeyboardInterrupt:
-            print("\n🛑 Stopping all streams...")
-            self.stop_all_streaming()
+            pass
+        print("\n🛑 Stopping all streams...")
+        self.stop_all_streaming()
     
     def stop_streaming(self, device_id: str):
         """Stop streaming for a specific device"""
@@ -442,34 +912,30 @@ class MinicapStreamManager:
                 stream_info = self.streaming_devices[device_id]
                 
                 # Stop the stream
-                stream_info['running'] = False
+                stream_info.running = False
                 
                 # Close socket connection
-                if stream_info.get('socket'):
-                    try:
-                        stream_info['socket'].close()
-                    except:
-                        pass
-                    stream_info['socket'] = None
+                self._close_stream_socket(stream_info)
                 
                 # Kill minicap process
-                if stream_info.get('process'):
-                    stream_info['process'].terminate()
+                if stream_info.process:
+                    stream_info.process.terminate()
                 
                 # Kill minicap process on device
                 subprocess.run([
                     'adb', '-s', device_id, 'shell', 'pkill', '-f', 'minicap'
-                ], capture_output=True, timeout=5)
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
                 
                 # Remove port forwarding
-                port = stream_info['port']
+                port = stream_info.port
                 subprocess.run([
                     'adb', '-s', device_id, 'forward', '--remove', f'tcp:{port}'
-                ], capture_output=True, timeout=5)
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
                 
-                # Clean up frame storage
-                if device_id in self.last_frames:
-                    del self.last_frames[device_id]
+                # Release frame storage and wake any waiting consumer
+                stream_info.latest = None
+                stream_info.decoded = None
+                stream_info.frame_ready.set()
                 
                 del self.streaming_devices[device_id]
                 print(f"✅ Streaming stopped for {device_id}")
@@ -483,8 +949,23 @@ class MinicapStreamManager:
         for device_id in device_ids:
             self.stop_streaming(device_id)
         
+        # Stop the shared I/O thread and decode pool
+        self._stop_event.set()
+        if self._io_thread is not None:
+            self._io_thread.join(timeout=2)
+            self._io_thread = None
+        if self._connect_pool is not None:
+            self._connect_pool.shutdown(wait=False, cancel_futures=True)
+            self._connect_pool = None
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False)
+            self._decode_pool = None
+        
         # Close all OpenCV windows
         cv2.destroyAllWindows()
+        self.display_frames.clear()
+        self._stop_event.clear()
+        self._display_closed.clear()
         print("✅ All streaming stopped")
     
     def cleanup(self, device_id: str):
@@ -494,12 +975,9 @@ class MinicapStreamManager:
             
             # Remove minicap files from device
             subprocess.run([
-                'adb', '-s', device_id, 'shell', 'rm', '-f', '/data/local/tmp/minicap'
-            ], capture_output=True, timeout=5)
-            
-            subprocess.run([
-                'adb', '-s', device_id, 'shell', 'rm', '-f', '/data/local/tmp/minicap.so'
-            ], capture_output=True, timeout=5)
+                'adb', '-s', device_id, 'shell',
+                'rm -f /data/local/tmp/minicap /data/local/tmp/minicap.so'
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
             
         except Exception as e:
             print(f"❌ Error cleaning up minicap for {device_id}: {e}") 
\ No newline at end of file
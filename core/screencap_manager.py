@@ -2,117 +2,528 @@
 Screencap Manager for basic screen capture using exec-out screencap
 
 This module provides a simple and reliable way to capture screenshots
-using the standard Android screencap command.
+using the standard Android screencap command. Frames are captured as the
+raw framebuffer rather than PNG, so the device skips compression and the
+host skips decoding.
 """
 
+import asyncio
+import queue
 import subprocess
+import struct
+import threading
 import time
 import cv2
 import numpy as np
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Tuple, Union
 from pathlib import Path
 
 
+# Raw `screencap` output starts with width, height and pixel format as little-endian
+# uint32s; Android 10+ adds a 4-byte color space field before the pixels
+_RAW_HEADER = struct.Struct('<III')
+_RAW_HEADER_SIZES = (_RAW_HEADER.size, _RAW_HEADER.size + 4)
+
+# Android PixelFormat -> conversion to BGR for the 4-byte-per-pixel formats
+_RAW_PIXEL_CONVERSIONS = {
+    1: cv2.COLOR_RGBA2BGR,  # RGBA_8888
+    2: cv2.COLOR_RGBA2BGR,  # RGBX_8888
+    5: cv2.COLOR_BGRA2BGR,  # BGRA_8888
+}
+
+
+# Written after every command on the persistent shell so replies can be delimited
+_SHELL_SENTINEL = b'__SCREENCAP_END__\n'
+_SHELL_ECHO_SENTINEL = 'echo __SCREENCAP_END__'
+_SHELL_END = f'; {_SHELL_ECHO_SENTINEL}\n'.encode()
+
+# Upper bound on a sane framebuffer; anything larger means the stream is out of sync
+_MAX_RAW_PIXELS = 8192 * 8192
+
+
+def _parse_raw_screencap(data: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """Parse a raw screencap header into (width, height, pixel format, pixel offset)"""
+    if len(data) < _RAW_HEADER.size:
+        return None
+    width, height, pixel_format = _RAW_HEADER.unpack_from(data)
+    offset = len(data) - width * height * 4
+    if offset not in _RAW_HEADER_SIZES or pixel_format not in _RAW_PIXEL_CONVERSIONS:
+        return None
+    return width, height, pixel_format, offset
+
+
+def _make_raw_converter(width: int, height: int, pixel_format: int, offset: int):
+    """Build a raw frame -> BGR converter specialized for one frame layout
+    
+    Shape, offset and conversion code are bound once, and the converter owns
+    its output buffer, so each frame is one view plus one cvtColor into it.
+    Every frame is returned as a new ndarray object over that buffer, so caches
+    keyed on the frame object (ImageDetector's pyramid level) never mistake a
+    new frame for the previous one.
+    """
+    count = width * height * 4
+    shape = (height, width, 4)
+    conversion = _RAW_PIXEL_CONVERSIONS[pixel_format]
+    dst = np.empty((height, width, 3), np.uint8)
+    
+    def convert(screenshot_data) -> np.ndarray:
+        pixels = np.frombuffer(screenshot_data, dtype=np.uint8, count=count, offset=offset).reshape(shape)
+        cv2.cvtColor(pixels, conversion, dst=dst)
+        return dst.view()
+    
+    return convert
+
+
+def _read_into(stream, view: memoryview):
+    """Fill view completely from an unbuffered pipe"""
+    while view:
+        count = stream.readinto(view)
+        if not count:
+            raise EOFError("adb shell closed")
+        view = view[count:]
+
+
+def _read_raw_frame(stream, alloc=bytearray) -> Optional[memoryview]:
+    """Read one raw screencap reply followed by the sentinel from a shell pipe
+    
+    The frame is read straight into a buffer from alloc(size), which may be
+    larger than size, and returned as a memoryview over it without copying.
+    """
+    header = bytearray(_RAW_HEADER.size)
+    _read_into(stream, memoryview(header))
+    if header == _SHELL_SENTINEL[:len(header)]:
+        # screencap printed nothing (failed); consume the rest of the sentinel
+        _read_into(stream, memoryview(bytearray(len(_SHELL_SENTINEL) - len(header))))
+        return None
+    
+    width, height, _ = _RAW_HEADER.unpack(header)
+    if not 0 < width * height <= _MAX_RAW_PIXELS:
+        raise ValueError(f"bad screencap header {width}x{height}")
+    
+    # Sized for the 16-byte header; the view is trimmed if the device sent 12 bytes
+    size = _RAW_HEADER.size + 4 + width * height * 4
+    view = memoryview(alloc(size))[:size]
+    view[:_RAW_HEADER.size] = header
+    _read_into(stream, view[_RAW_HEADER.size:-4])
+    
+    tail = bytearray(len(_SHELL_SENTINEL))
+    _read_into(stream, memoryview(tail))
+    if tail == _SHELL_SENTINEL:
+        return view[:-4]
+    
+    # Android 10+ header carries a color space field, so 4 pixel bytes are still due
+    view[-4:] = tail[:4]
+    rest = tail[4:] + bytearray(4)
+    _read_into(stream, memoryview(rest)[-4:])
+    if rest != _SHELL_SENTINEL:
+        raise ValueError("screencap reply out of sync")
+    return view
+
+
+def _read_raw_frames(stream, count: int) -> list:
+    """Read count sentinel-delimited raw frames plus the command's own sentinel
+    
+    Returns (frame, monotonic_ns arrival time) pairs.
+    """
+    frames = []
+    for _ in range(count):
+        frames.append((_read_raw_frame(stream), time.monotonic_ns()))
+    
+    tail = bytearray(len(_SHELL_SENTINEL))
+    _read_into(stream, memoryview(tail))
+    if tail != _SHELL_SENTINEL:
+        raise ValueError("screencap reply out of sync")
+    return frames
+
+
+def _read_until_sentinel(stream) -> bytes:
+    """Read a text reply up to the sentinel from a shell pipe"""
+    reply = bytearray()
+    while not reply.endswith(_SHELL_SENTINEL):
+        chunk = stream.read(4096)
+        if not chunk:
+            raise EOFError("adb shell closed")
+        reply += chunk
+    return bytes(reply[:-len(_SHELL_SENTINEL)])
+
+
 class ScreencapManager:
     """Manages basic screen capture using exec-out screencap"""
     
-    def __init__(self):
+    def __init__(self, device_info_ttl: Optional[float] = None, verbose: bool = False):
+        self.verbose = verbose  # Per-capture progress output; errors are always printed
         self.device_info = {}
+        self._device_info_time = {}
+        self.device_info_ttl = device_info_ttl  # Seconds; None caches until invalidated
         self.last_screenshot_time = {}
         self.screenshot_count = {}
+        
+        # One long-lived `adb shell` per device; commands are streamed over stdin
+        self._shells: dict[str, subprocess.Popen] = {}
+        self._shell_locks: dict[str, threading.Lock] = {}
+        self._shell_locks_guard = threading.Lock()
+        
+        # Per-device raw input buffers and layout-specialized converters used by
+        # get_screenshot_as_image; converters are keyed by (raw header, frame size)
+        self._raw_buf: dict[str, bytearray] = {}
+        self._raw_converters: dict[str, tuple] = {}
+        
+        # Screenshots to write are handed to a background writer, started on first save
+        self._save_queue: queue.Queue = queue.Queue(maxsize=256)
+        self._save_thread: Optional[threading.Thread] = None
+        self._save_thread_lock = threading.Lock()
+    
+    def _shell_lock(self, device_id: str) -> threading.Lock:
+        """Get the lock serializing commands on a device's shell"""
+        with self._shell_locks_guard:
+            lock = self._shell_locks.get(device_id)
+            if lock is None:
+                lock = self._shell_locks[device_id] = threading.Lock()
+            return lock
+    
+    def _shell_command(self, device_id: str, command: str, read_reply, timeout: float):
+        """Run a command on the device's persistent shell and parse its reply
+        
+        Spawns the shell on first use. Stdin is a pipe, so adb runs the shell
+        without a pty and binary output comes through unmangled. If the reply
+        doesn't arrive within timeout the shell is killed, and any failure
+        drops the shell so the next call starts a fresh one.
+        """
+        with self._shell_lock(device_id):
+            shell = self._shells.get(device_id)
+            if shell is None or shell.poll() is not None:
+                shell = self._shells[device_id] = subprocess.Popen(
+                    ['adb', '-s', device_id, 'shell'],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL, bufsize=0
+                )
+            
+            watchdog = threading.Timer(timeout, shell.kill)
+            watchdog.start()
+            try:
+                shell.stdin.write(command.encode() + _SHELL_END)
+                return read_reply(shell.stdout)
+            except Exception:
+                self._close_shell(device_id)
+                raise
+            finally:
+                watchdog.cancel()
+    
+    def _close_shell(self, device_id: str):
+        """Terminate a device's persistent shell"""
+        shell = self._shells.pop(device_id, None)
+        if shell is None:
+            return
+        try:
+            shell.stdin.close()
+            shell.terminate()
+            shell.wait(timeout=2)
+        except Exception:
+            shell.kill()
+    
+    def close(self, device_id: Optional[str] = None):
+        """Close the persistent shell for one device, or for all devices
+        
+        Closing all devices also waits for queued screenshot saves to finish.
+        """
+        if device_id is None and self._save_thread is not None:
+            self._save_queue.join()
+        
+        device_ids = [device_id] if device_id else list(self._shells)
+        for shell_device_id in device_ids:
+            with self._shell_lock(shell_device_id):
+                self._close_shell(shell_device_id)
+    
+    def invalidate_device_info(self, device_id: Optional[str] = None):
+        """Forget cached device info (e.g. after rotation), for one or all devices"""
+        if device_id is None:
+            self.device_info.clear()
+            self._device_info_time.clear()
+        else:
+            self.device_info.pop(device_id, None)
+            self._device_info_time.pop(device_id, None)
     
     def get_device_info(self, device_id: str) -> Optional[dict]:
-        """Get device screen dimensions and density"""
+        """Get device screen dimensions and density
+        
+        Results are cached per device for device_info_ttl seconds, or until
+        invalidate_device_info is called when no TTL is set.
+        """
+        cached = self.device_info.get(device_id)
+        if cached is not None:
+            if self.device_info_ttl is None or \
+                    time.monotonic() - self._device_info_time[device_id] < self.device_info_ttl:
+                return cached
+        
         try:
-            # Get screen dimensions
-            result = subprocess.run([
-                'adb', '-s', device_id, 'shell', 'wm', 'size'
-            ], capture_output=True, timeout=5)
+            # Get screen dimensions and density in one round trip
+            output = self._shell_command(
+                device_id, 'wm size 2>/dev/null; wm density 2>/dev/null', _read_until_sentinel, 5
+            ).decode()
+            
+            size_lines = [line for line in output.splitlines() if 'size' in line]
+            density_lines = [line for line in output.splitlines() if 'density' in line]
             
-            if result.returncode != 0:
+            if not size_lines:
                 return None
-                
-            size_output = result.stdout.decode().strip()
-            width, height = map(int, size_output.split()[-1].split('x'))
             
-            # Get screen density
-            result = subprocess.run([
-                'adb', '-s', device_id, 'shell', 'wm', 'density'
-            ], capture_output=True, timeout=5)
+            width, height = map(int, size_lines[-1].split()[-1].split('x'))
             
-            if result.returncode != 0:
+            if not density_lines:
                 density = 420  # Default density
             else:
-                density_output = result.stdout.decode().strip()
-                density = int(density_output.split()[-1])
+                density = int(density_lines[-1].split()[-1])
             
-            return {
+            info = {
                 'width': width,
                 'height': height,
                 'density': density
             }
+            self.device_info[device_id] = info
+            self._device_info_time[device_id] = time.monotonic()
+            return info
             
         except Exception as e:
             print(f"❌ Error getting device info for {device_id}: {e}")
             return None
     
-    def get_screenshot(self, device_id: str, save_to_file: bool = False) -> Optional[bytes]:
-        """Get screenshot using exec-out screencap"""
-        import time
-        start_time = time.time()
+    def _raw_buffer(self, device_id: str, size: int) -> bytearray:
+        """Get the device's reusable raw frame buffer, growing it if needed"""
+        raw_buf = self._raw_buf.get(device_id)
+        if raw_buf is None or len(raw_buf) < size:
+            raw_buf = self._raw_buf[device_id] = bytearray(size)
+        return raw_buf
+    
+    def get_screenshot(self, device_id: str, save_to_file: bool = False,
+                       reuse_buffer: bool = False, validate: bool = False) -> Optional[bytes]:
+        """Get screenshot using screencap over the persistent adb shell
+        
+        Returns the raw framebuffer as written by `screencap` (header followed by
+        4-byte pixels) as a bytes-like object; use raw_to_image to turn it into
+        an OpenCV image. With reuse_buffer the frame is read into a per-device
+        buffer that the next reusing call overwrites, avoiding a fresh
+        allocation per frame. Only the header is checked unless validate or
+        save_to_file asks for a full conversion.
+        """
+        start_ns = time.monotonic_ns()
         
         try:
-            # Use exec-out screencap for direct binary output
-            result = subprocess.run([
-                'adb', '-s', device_id, 'exec-out', 'screencap', '-p'
-            ], capture_output=True, timeout=15)
-            
-            elapsed = (time.time() - start_time) * 1000
-            
-            if result.returncode == 0 and result.stdout:
-                # Validate the image data
-                image_array = np.frombuffer(result.stdout, dtype=np.uint8)
-                img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-                
-                if img is not None:
-                    h, w = img.shape[:2]
-                    
-                    # Update stats
-                    if device_id not in self.screenshot_count:
-                        self.screenshot_count[device_id] = 0
-                    self.screenshot_count[device_id] += 1
-                    self.last_screenshot_time[device_id] = time.time()
-                    
-                    print(f"📸 Screenshot captured for {device_id}: {w}x{h} in {elapsed:.1f}ms")
-                    
-                    # Save to file if requested
-                    if save_to_file:
-                        self._save_screenshot(device_id, result.stdout)
-                    
-                    return result.stdout
+            # Stream screencap through the persistent shell; without -p the
+            # device sends the framebuffer as-is instead of PNG-compressing it
+            try:
+                if reuse_buffer:
+                    read_reply = lambda stream: _read_raw_frame(
+                        stream, lambda size: self._raw_buffer(device_id, size)
+                    )
                 else:
-                    print(f"❌ Failed to decode screenshot for {device_id} (took {elapsed:.1f}ms)")
-                    return None
+                    read_reply = _read_raw_frame
+                screenshot_data = self._shell_command(
+                    device_id, 'screencap 2>/dev/null', read_reply, 15
+                )
+            except Exception as e:
+                # Shell broke mid-reply; fall back to a one-shot exec-out capture
+                print(f"⚠️ Persistent shell failed for {device_id} ({e}), using exec-out")
+                result = subprocess.run([
+                    'adb', '-s', device_id, 'exec-out', 'screencap'
+                ], capture_output=True, timeout=15)
+                screenshot_data = result.stdout if result.returncode == 0 else None
+                error = result.stderr
             else:
-                error_msg = result.stderr.decode() if result.stderr else 'unknown error'
-                print(f"❌ Screencap failed for {device_id} (took {elapsed:.1f}ms): {error_msg}")
-                return None
+                error = None
+            
+            elapsed = (time.monotonic_ns() - start_ns) / 1e6
+            return self._finish_capture(device_id, screenshot_data, error, elapsed, save_to_file, validate)
                 
         except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic_ns() - start_ns) / 1e6
             print(f"❌ Error getting screenshot for {device_id} (took {elapsed:.1f}ms): {e}")
             return None
     
+    async def get_screenshot_async(self, device_id: str, save_to_file: bool = False,
+                                   validate: bool = False) -> Optional[bytes]:
+        """Get screenshot with a one-shot exec-out screencap driven by asyncio
+        
+        Lets a single event loop keep captures for many devices in flight
+        without a thread per device.
+        """
+        start_ns = time.monotonic_ns()
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'adb', '-s', device_id, 'exec-out', 'screencap',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=15)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise TimeoutError("screencap timed out")
+            
+            elapsed = (time.monotonic_ns() - start_ns) / 1e6
+            screenshot_data = stdout if process.returncode == 0 else None
+            return self._finish_capture(device_id, screenshot_data, stderr, elapsed, save_to_file, validate)
+            
+        except Exception as e:
+            elapsed = (time.monotonic_ns() - start_ns) / 1e6
+            print(f"❌ Error getting screenshot for {device_id} (took {elapsed:.1f}ms): {e}")
+            return None
+    
+    async def get_screenshots_all(self, device_ids: list[str]) -> dict[str, bytes]:
+        """Capture one screenshot from each device concurrently on the event loop"""
+        screenshots = await asyncio.gather(*(self.get_screenshot_async(device_id) for device_id in device_ids))
+        return {device_id: data for device_id, data in zip(device_ids, screenshots) if data}
+    
+    def _finish_capture(self, device_id: str, screenshot_data, error: Optional[bytes],
+                        elapsed: float, save_to_file: bool, validate: bool = False):
+        """Validate a captured framebuffer, update stats and optionally save it"""
+        if not screenshot_data:
+            error_msg = error.decode(errors='replace') if error else 'no output'
+            print(f"❌ Screencap failed for {device_id} (took {elapsed:.1f}ms): {error_msg}")
+            return None
+        
+        # Validate the framebuffer header; a full conversion only happens on request
+        layout = _parse_raw_screencap(screenshot_data)
+        if layout is None:
+            print(f"❌ Unrecognized raw screenshot format for {device_id} (took {elapsed:.1f}ms)")
+            return None
+        w, h = layout[:2]
+        
+        image = None
+        if validate or save_to_file:
+            image = self.raw_to_image(screenshot_data)
+            if image is None:
+                print(f"❌ Failed to convert screenshot for {device_id} (took {elapsed:.1f}ms)")
+                return None
+        
+        # Update stats
+        if device_id not in self.screenshot_count:
+            self.screenshot_count[device_id] = 0
+        self.screenshot_count[device_id] += 1
+        self.last_screenshot_time[device_id] = time.monotonic_ns()
+        
+        if self.verbose:
+            print(f"📸 Screenshot captured for {device_id}: {w}x{h} in {elapsed:.1f}ms")
+        
+        # Save to file if requested
+        if save_to_file:
+            self._save_screenshot(device_id, image)
+        
+        return screenshot_data
+    
     def get_screenshot_as_image(self, device_id: str) -> Optional[np.ndarray]:
-        """Get screenshot as OpenCV image array"""
-        screenshot_data = self.get_screenshot(device_id)
-        if screenshot_data:
-            image_array = np.frombuffer(screenshot_data, dtype=np.uint8)
-            return cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-        return None
+        """Get screenshot as OpenCV image array
+        
+        The image is written into a buffer owned by the manager and reused for
+        the device's next screenshot; call .copy() to keep it longer.
+        """
+        screenshot_data = self.get_screenshot(device_id, reuse_buffer=True)
+        if not screenshot_data:
+            return None
+        
+        # Rebuild the converter only when the layout changes (resolution, rotation)
+        layout_key = (bytes(screenshot_data[:_RAW_HEADER.size]), len(screenshot_data))
+        cached = self._raw_converters.get(device_id)
+        if cached is None or cached[0] != layout_key:
+            layout = _parse_raw_screencap(screenshot_data)
+            if layout is None:
+                return None
+            cached = self._raw_converters[device_id] = (layout_key, _make_raw_converter(*layout))
+        
+        return cached[1](screenshot_data)
     
-    def get_multiple_screenshots(self, device_id: str, count: int = 5, delay: float = 0.1) -> list[bytes]:
-        """Get multiple screenshots with optional delay"""
+    def raw_to_image(self, screenshot_data: bytes, dst: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Convert a raw screencap framebuffer to a BGR OpenCV image
+        
+        If dst is a matching (height, width, 3) uint8 array the image is written
+        into it instead of a fresh allocation.
+        """
+        layout = _parse_raw_screencap(screenshot_data)
+        if layout is None:
+            return None
+        width, height, pixel_format, offset = layout
+        
+        # Zero-copy view over the pixel payload, then a single SIMD channel conversion
+        pixels = np.frombuffer(screenshot_data, dtype=np.uint8, count=width * height * 4,
+                               offset=offset).reshape(height, width, 4)
+        return cv2.cvtColor(pixels, _RAW_PIXEL_CONVERSIONS[pixel_format], dst=dst)
+    
+    def get_screenshots_parallel(self, device_ids: list[str]) -> dict[str, bytes]:
+        """Capture one screenshot from each device concurrently
+        
+        Captures are I/O bound, so wall time tracks the slowest device rather
+        than the sum. Devices that fail to capture are left out of the result.
+        """
+        return self._run_per_device(device_ids, self.get_screenshot)
+    
+    def _run_per_device(self, device_ids: list[str], capture) -> dict:
+        """Run capture(device_id) for every device on its own worker thread"""
+        results = {}
+        if not device_ids:
+            return results
+        
+        # Commands on one device are serialized by its shell lock, so workers
+        # for different devices never interleave on the same pipe
+        with ThreadPoolExecutor(max_workers=len(device_ids)) as executor:
+            futures = {executor.submit(capture, device_id): device_id for device_id in device_ids}
+            for future in as_completed(futures):
+                device_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ Capture failed for {device_id}: {e}")
+                    continue
+                if result:
+                    results[device_id] = result
+        
+        return results
+    
+    def get_multiple_screenshots(self, device_id: Union[str, list[str]], count: int = 5,
+                                 delay: float = 0.1) -> Union[list[bytes], dict[str, list[bytes]]]:
+        """Get multiple screenshots with optional delay
+        
+        The whole sequence runs as one loop on the device's persistent shell,
+        so frames stream back-to-back down one pipe. Given a list of device
+        IDs, each device's sequence runs in parallel and a dict of
+        device ID -> screenshots is returned.
+        """
+        if not isinstance(device_id, str):
+            return self._run_per_device(
+                device_id, lambda single_id: self.get_multiple_screenshots(single_id, count, delay)
+            )
+        
+        if count <= 0:
+            return []
+        
+        # Each frame gets its own sentinel; the sleep is skipped after the last one
+        pause = f'; [ $i -lt {count} ] && sleep {delay}' if delay > 0 else ''
+        command = f'for i in $(seq {count}); do screencap 2>/dev/null; {_SHELL_ECHO_SENTINEL}{pause}; done'
+        
+        start_ns = time.monotonic_ns()
+        try:
+            frames = self._shell_command(
+                device_id, command, lambda stream: _read_raw_frames(stream, count), 15 * count
+            )
+        except Exception as e:
+            print(f"⚠️ Batched capture failed for {device_id} ({e}), capturing one at a time")
+            return self._get_screenshots_serial(device_id, count, delay)
+        
+        screenshots = []
+        for screenshot_data, arrived_ns in frames:
+            # Time since the previous frame arrived, including the on-device delay
+            elapsed = (arrived_ns - start_ns) / 1e6
+            start_ns = arrived_ns
+            
+            screenshot = self._finish_capture(device_id, screenshot_data, None, elapsed, False)
+            if not screenshot:
+                break
+            screenshots.append(screenshot)
+        
+        return screenshots
+    
+    def _get_screenshots_serial(self, device_id: str, count: int, delay: float) -> list[bytes]:
+        """Get multiple screenshots one get_screenshot call at a time"""
         screenshots = []
         
         for i in range(count):
@@ -126,35 +537,61 @@ class ScreencapManager:
         
         return screenshots
     
-    def _save_screenshot(self, device_id: str, screenshot_data: bytes):
-        """Save screenshot to file"""
+    def _save_screenshot(self, device_id: str, image: np.ndarray):
+        """Queue screenshot to be saved to file by the background writer"""
+        if self._save_thread is None:
+            with self._save_thread_lock:
+                if self._save_thread is None:
+                    # Create tmp folder once, before the writer takes any work
+                    Path("tmp").mkdir(exist_ok=True)
+                    self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+                    self._save_thread.start()
+        
+        # Save screenshot with device ID and timestamp
+        timestamp = time.time_ns() // 1_000_000  # Milliseconds timestamp
+        screenshot_path = Path("tmp") / f"screenshot_{device_id}_{timestamp}.png"
+        
         try:
-            # Create tmp folder if it doesn't exist
-            tmp_dir = Path("tmp")
-            tmp_dir.mkdir(exist_ok=True)
-            
-            # Save screenshot with device ID and timestamp
-            timestamp = int(time.time() * 1000)  # Milliseconds timestamp
-            screenshot_path = tmp_dir / f"screenshot_{device_id}_{timestamp}.jpg"
-            
-            with open(screenshot_path, 'wb') as f:
-                f.write(screenshot_data)
-            
-            print(f"💾 Screenshot saved: {screenshot_path}")
-            
-        except Exception as e:
-            print(f"⚠️ Failed to save screenshot: {e}")
+            self._save_queue.put_nowait((screenshot_path, image))
+        except queue.Full:
+            # Capture must not wait on the disk; drop the save instead
+            print(f"⚠️ Save queue full, dropping screenshot for {device_id}")
+    
+    def _save_worker(self):
+        """Encode and write queued screenshots off the capture thread"""
+        while True:
+            screenshot_path, image = self._save_queue.get()
+            try:
+                # Encode the converted framebuffer only when it is actually written out
+                ok, encoded = cv2.imencode('.png', image)
+                if not ok:
+                    raise ValueError("PNG encoding failed")
+                
+                with open(screenshot_path, 'wb') as f:
+                    f.write(encoded)
+                
+                if self.verbose:
+                    print(f"💾 Screenshot saved: {screenshot_path}")
+                
+            except Exception as e:
+                print(f"⚠️ Failed to save screenshot: {e}")
+            finally:
+                self._save_queue.task_done()
     
     def get_stats(self, device_id: str) -> dict:
-        """Get screenshot statistics for device"""
+        """Get screenshot statistics for device
+        
+        last_screenshot_time is a time.monotonic_ns() reading; time_since_last
+        is in seconds.
+        """
         stats = {
             'total_screenshots': self.screenshot_count.get(device_id, 0),
             'last_screenshot_time': self.last_screenshot_time.get(device_id),
             'device_info': self.device_info.get(device_id)
         }
         
-        if stats['last_screenshot_time']:
-            stats['time_since_last'] = time.time() - stats['last_screenshot_time']
+        if stats['last_screenshot_time'] is not None:
+            stats['time_since_last'] = (time.monotonic_ns() - stats['last_screenshot_time']) / 1e9
         
         return stats
     
@@ -175,15 +612,14 @@ class ScreencapManager:
             device_info = self.get_device_info(device_id)
             if device_info:
                 results['device_info'] = True
-                self.device_info[device_id] = device_info
                 print(f"✅ Device info: {device_info['width']}x{device_info['height']}")
             else:
                 results['errors'].append("Failed to get device info")
             
             # Test screenshot
-            start_time = time.time()
-            screenshot = self.get_screenshot(device_id)
-            results['timing'] = (time.time() - start_time) * 1000
+            start_ns = time.monotonic_ns()
+            screenshot = self.get_screenshot(device_id, validate=True)
+            results['timing'] = (time.monotonic_ns() - start_ns) / 1e6
             
             if screenshot:
                 results['screenshot'] = True
@@ -191,8 +627,7 @@ class ScreencapManager:
                 
                 # Test image decoding
                 try:
-                    image_array = np.frombuffer(screenshot, dtype=np.uint8)
-                    img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+                    img = self.raw_to_image(screenshot)
                     if img is not None:
                         results['image_decode'] = True
                         print(f"✅ Image decoded: {img.shape[1]}x{img.shape[0]}")
@@ -214,10 +649,13 @@ def test_screencap_manager(device_id: str):
     print(f"🧪 Testing ScreencapManager for device: {device_id}")
     print("=" * 50)
     
-    manager = ScreencapManager()
+    manager = ScreencapManager(verbose=True)
     
     # Run test
-    results = manager.test_screencap(device_id)
+    try:
+        results = manager.test_screencap(device_id)
+    finally:
+        manager.close()
     
     print(f"\n📊 Test Results:")
     print(f"   Device Info: {'✅' if results['device_info'] else '❌'}")
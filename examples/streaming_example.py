@@ -88,9 +88,8 @@ def example_custom_streaming():
         
         print("✅ All streams started. Press Ctrl+C to stop.")
         
-        # Keep running until interrupted
-        while any(info.get('running', False) for info in stream_manager.streaming_devices.values()):
-            time.sleep(0.1)
+        # Show frames on this thread until ESC or interrupted
+        stream_manager.run_display_loop()
             
     except KeyboardInterrupt:
         print("\n🛑 Stopping all streams...")
@@ -3,9 +3,9 @@ Base Game Class for automation framework
 """
 
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Dict, Any, List, Optional, Tuple
 import json
-import os
 from pathlib import Path
 
 # Import action types
@@ -24,6 +24,7 @@ class BaseGame(ABC):
         self.discord_webhook_url = None
         self.project_root = Path(__file__).parent.parent
         self.counter = 0  # Initialize counter at 0
+        self._score_cache = None  # (detected items, calculate_score result) of the last call
         
         # Load configuration
         self.load_config()
@@ -79,16 +80,22 @@ class BaseGame(ABC):
     def load_config(self):
         """Load game configuration from file"""
         try:
-            # Try custom config path first
-            if self.config_path and os.path.exists(self.config_path):
-                config_file = self.config_path
-            else:
-                # Use default game config
-                config_file = self.project_root / "games" / self.game_name / "config.json"
+            # Try custom config path first, then the default game config;
+            # opening directly avoids a separate stat per candidate
+            candidates = [self.project_root / "games" / self.game_name / "config.json"]
+            if self.config_path:
+                candidates.insert(0, Path(self.config_path))
+            
+            config_data = None
+            for config_file in candidates:
+                try:
+                    config_data = config_file.read_bytes()
+                    break
+                except FileNotFoundError:
+                    continue
             
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    self.config = json.load(f)
+            if config_data is not None:
+                self.config = json.loads(config_data)
                     
                 # Update settings from config
                 if 'cycles_per_session' in self.config:
@@ -120,9 +127,45 @@ class BaseGame(ABC):
                 "next_states": ["next_state1", "next_state2"]
             }
         }
+        
+        Called once per instance; use the automation_states property to read it.
         """
         pass
     
+    @cached_property
+    def automation_states(self) -> Dict[str, Dict[str, Any]]:
+        """Automation states built once from get_automation_states
+        
+        Shared by every caller, so it must be treated as read-only.
+        """
+        return self.get_automation_states()
+    
+    @cached_property
+    def _validated_action_ids(self) -> frozenset:
+        """Ids of every valid action dict in the automation states, checked once
+        
+        The states are cached for the game's lifetime, so the ids stay stable.
+        """
+        valid_ids = set()
+        pending = []
+        for state_config in self.automation_states.values():
+            pending.extend(state_config.get('actions') or [])
+            pending.extend(state_config.get('if_true_actions') or [])
+            pending.extend(state_config.get('if_false_actions') or [])
+        while pending:
+            action = pending.pop()
+            if id(action) in valid_ids or validate_action_config(action):
+                continue
+            valid_ids.add(id(action))
+            # Nested loop/conditional actions
+            for key in ('actions', 'if_true', 'if_false'):
+                pending.extend(action.get(key) or [])
+        return frozenset(valid_ids)
+    
+    def is_validated_action(self, action_config: Dict[str, Any]) -> bool:
+        """Check whether an action is part of the automation states and already validated"""
+        return id(action_config) in self._validated_action_ids
+    
     @abstractmethod
     def get_app_package(self) -> str:
         """Return the app package name"""
@@ -182,7 +225,12 @@ class BaseGame(ABC):
     
     def get_state_timeouts(self) -> Dict[str, Optional[int]]:
         """Get timeout configuration for each state"""
-        automation_states = self.get_automation_states()
+        return self._state_timeouts
+    
+    @cached_property
+    def _state_timeouts(self) -> Dict[str, Optional[int]]:
+        """Per-state timeouts derived once from the automation states"""
+        automation_states = self.automation_states
         timeouts = {}
         for state, config in automation_states.items():
             # If timeout is not specified, use None (no timeout)
@@ -233,9 +281,21 @@ class BaseGame(ABC):
     
     def create_instance_data(self, device_id: str, instance_number: int, verbose: bool = False) -> Dict[str, Any]:
         """Create initial instance data structure"""
+        instance_data = self._instance_template.copy()
+        instance_data['device_id'] = device_id
+        instance_data['instance_number'] = instance_number
+        instance_data['verbose'] = verbose
+        # Fresh containers so instances never share mutable state
+        instance_data['detected_items'] = []
+        instance_data['game_specific_data'] = {}
+        return instance_data
+    
+    @cached_property
+    def _instance_template(self) -> Dict[str, Any]:
+        """Instance data fields shared by every new instance, built on first use"""
         return {
-            'device_id': device_id,
-            'instance_number': instance_number,
+            'device_id': None,
+            'instance_number': None,
             'detected_items': [],
             'cycle_count': 0,
             'session_count': 0,
@@ -243,12 +303,17 @@ class BaseGame(ABC):
             'last_state_change': 0,
             'account_id': None,
             'game_specific_data': {},
-            'verbose': verbose
+            'verbose': False
         }
     
     def get_initial_state(self) -> str:
         """Get the initial automation state"""
-        states = self.get_automation_states()
+        return self._initial_state
+    
+    @cached_property
+    def _initial_state(self) -> str:
+        """Initial state derived once from the automation states"""
+        states = self.automation_states
         # Return the first state that has no dependencies
         for state_name, state_config in states.items():
             if not state_config.get('requires_previous_state', False):
@@ -256,18 +321,32 @@ class BaseGame(ABC):
         # Fallback to first state
         return list(states.keys())[0] if states else "initial"
     
+    def calculate_score_cached(self, detected_items: List[str]) -> Tuple[int, Dict[str, int]]:
+        """
+        calculate_score for items that were just scored, without recomputing
+        Session completion scores the same items for the log, the notification
+        check and the Discord payload; this computes them once.
+        """
+        key = tuple(detected_items)
+        cached = self._score_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = self.calculate_score(detected_items)
+        self._score_cache = (key, result)
+        return result
+    
     def should_send_discord_notification(self, detected_items: List[str]) -> bool:
         """Check if results meet Discord notification criteria"""
         if not self.has_discord_webhook():
             return False
         
-        total_score, _ = self.calculate_score(detected_items)
+        total_score, _ = self.calculate_score_cached(detected_items)
         return total_score >= self.get_minimum_score_threshold()
     
     def format_results_for_discord(self, instance_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format results for Discord notification"""
         detected_items = instance_data.get('detected_items', [])
-        total_score, score_breakdown = self.calculate_score(detected_items)
+        total_score, score_breakdown = self.calculate_score_cached(detected_items)
         
         return {
             'total_score': total_score,
@@ -3,14 +3,9 @@ FMJP Game Implementation
 Minimal implementation of the BaseGame class for FMJP automation
 """
 
-import time
-from turtle import delay
-import cv2
-import os
-import pytesseract
-import numpy as np
-from typing import Dict, Any, List, Tuple, Optional
-from pathlib import Path
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Tuple, Optional
 from games.base_game import BaseGame
 from core.action_types import (
     create_conditional_action, create_loop_action, create_macro_action, create_swipe_action, create_tap_action, create_wait_action, create_typing_action,
@@ -18,6 +13,13 @@ from core.action_types import (
 )
 
 
+# Every character's first then second skill; tapped while waiting out the battle loops
+_SKILL_ROTATION = tuple(
+    create_tap_action(f"battle_char_{char}_skill_{skill}", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1)
+    for skill in (1, 2) for char in (1, 2, 3, 4)
+)
+
+
 class FmjpGame(BaseGame):
     """FMJP specific game implementation"""
     
@@ -27,6 +29,25 @@ class FmjpGame(BaseGame):
         
         # FMJP specific constants
         self.last_score = {}  # Per-instance tracking
+        
+        # Config values resolved once; the getters below run inside the automation loop
+        self._card_scoring = MappingProxyType(dict(self.config.get('card_scoring', {})))
+        self._default_item_score = self.config.get('default_item_score', 5)
+        self._minimum_score_threshold = self.config.get('minimum_score_threshold', 10)
+        self._device_resolution = tuple(self.config.get('device_resolution', [540, 960]))
+        self._detection_regions = MappingProxyType({
+            slot: tuple(region) for slot, region in self.config.get('detection_regions', {}).items()
+        })
+        self._config_state_timeouts = self.config.get('state_timeouts', {})
+        self._template_thresholds = MappingProxyType(self.config.get('template_thresholds', {}))
+        
+        # Static parts of the Discord embed; only the values change per notification
+        self._discord_title = f"🎮 {self.get_display_name()} Results"
+        self._discord_fields = (
+            MappingProxyType({"name": "📊 Total Score", "inline": True}),
+            MappingProxyType({"name": "🎴 Items Found", "inline": True}),
+            MappingProxyType({"name": "🔄 Cycles Completed", "inline": True}),
+        )
     
     def log_verbose_config(self, device_id: str = 'system'):
         """Log detailed configuration information for debugging"""
@@ -35,7 +56,7 @@ class FmjpGame(BaseGame):
         print(f"   📱 App activity: {self.get_app_activity()}")
         print(f"   🎯 Cycles per session: {self.get_cycles_per_session()}")
         print(f"   📐 Device resolution: {self.get_device_resolution()}")
-        print(f"   💎 Card scoring: {self.get_card_scoring()}")
+        print(f"   💎 Card scoring: {dict(self.get_card_scoring())}")
         print(f"   📊 Default item score: {self.get_default_item_score()}")
         print(f"   🎯 Score threshold: {self.get_minimum_score_threshold()}")
         
@@ -51,7 +72,7 @@ class FmjpGame(BaseGame):
         
         print(f"   🔗 Discord webhook: {'✅ Configured' if self.has_discord_webhook() else '❌ Not configured'}")
         
-        automation_states = self.get_automation_states()
+        automation_states = self.automation_states
         print(f"   🔄 Automation states: {len(automation_states)} states configured")
         for state_name, state_config in automation_states.items():
             templates = state_config.get('templates', [])
@@ -147,16 +168,7 @@ class FmjpGame(BaseGame):
                     create_loop_action(
                         condition="battle_2_3_text",
                         condition_likelihood=0.8,
-                        actions=[
-                            create_tap_action("battle_char_1_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_2_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_3_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_4_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_1_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_2_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_3_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_4_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                        ],
+                        actions=list(_SKILL_ROTATION),
                     ),
                     create_loop_action(
                         condition="focus_icon",
@@ -195,14 +207,7 @@ class FmjpGame(BaseGame):
                         condition="tutorial_member_open",
                         condition_likelihood=0.6,
                         actions=[
-                            create_tap_action("battle_char_1_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_2_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_3_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_4_skill_1", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_1_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_2_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_3_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
-                            create_tap_action("battle_char_4_skill_2", likelihood=0.6, timeout=1, tap_times=2, tap_delay=1),
+                            *_SKILL_ROTATION,
                             create_conditional_action(
                                 condition="battle_2_link_1",
                                 if_true=[
@@ -233,7 +238,7 @@ class FmjpGame(BaseGame):
                     create_tap_action("battle_btn", delay_after=2, tap_times=2, tap_delay=1),
                     create_tap_action("battle_home_btn", delay_after=2, tap_times=2, tap_delay=1),
                 ],
-                "next_states": ["main_loop"]
+                "next_states": "main_loop"
             },
             "main_loop": {
                 "timeout": 60,
@@ -248,7 +253,7 @@ class FmjpGame(BaseGame):
                 "timeout": 10,
                 "templates": [],
                 "actions": [],
-                "next_states": ["start"]
+                "next_states": "start"
             }
         }
     
@@ -262,20 +267,22 @@ class FmjpGame(BaseGame):
     
     def calculate_score(self, detected_items: List[str]) -> Tuple[int, Dict[str, int]]:
         """Calculate score based on detected items"""
-        card_scoring = self.get_card_scoring()
+        get_score = self._card_scoring.get
+        default_score = self._default_item_score
         total_score = 0
         item_scores = {}
         
-        for item in detected_items:
-            score = card_scoring.get(item, self.get_default_item_score())
+        # One lookup per distinct item; repeats only multiply into the total
+        for item, count in Counter(detected_items).items():
+            score = get_score(item, default_score)
             item_scores[item] = score
-            total_score += score
+            total_score += score * count
         
         return total_score, item_scores
     
     def get_minimum_score_threshold(self) -> int:
         """Return minimum score threshold for notifications"""
-        return self.config.get('minimum_score_threshold', 10)
+        return self._minimum_score_threshold
     
     def process_screenshot_for_items(self, screenshot, instance_data: Dict[str, Any]) -> List[str]:
         """Process screenshot to detect items/cards"""
@@ -300,29 +307,27 @@ class FmjpGame(BaseGame):
     
     def get_device_resolution(self) -> Tuple[int, int]:
         """Return the expected device resolution for FMJP"""
-        resolution = self.config.get('device_resolution', [540, 960])
-        return tuple(resolution)
+        return self._device_resolution
     
-    def get_detection_regions(self) -> Dict[str, Tuple[float, float, float, float]]:
-        """Return detection regions for item recognition"""
-        return self.config.get('detection_regions', {})
+    def get_detection_regions(self) -> Mapping[str, Tuple[float, float, float, float]]:
+        """Return detection regions for item recognition (read-only, shared)"""
+        return self._detection_regions
     
-    def get_card_scoring(self) -> Dict[str, int]:
-        """Return scoring values for different cards/items"""
-        return self.config.get('card_scoring', {})
+    def get_card_scoring(self) -> Mapping[str, int]:
+        """Return scoring values for different cards/items (read-only, shared)"""
+        return self._card_scoring
     
     def get_default_item_score(self) -> int:
         """Return default score for unrecognized items"""
-        return self.config.get('default_item_score', 5)
+        return self._default_item_score
     
     def get_state_timeouts(self) -> Dict[str, Optional[int]]:
         """Return custom timeouts for different states"""
-        return self.config.get('state_timeouts', {})
+        return self._config_state_timeouts
     
     def get_template_threshold(self, template_name: str) -> float:
         """Return template matching threshold for specific templates"""
-        template_thresholds = self.config.get('template_thresholds', {})
-        return template_thresholds.get(template_name, 0.8)
+        return self._template_thresholds.get(template_name, 0.8)
     
     def get_initial_state(self) -> str:
         """Return the initial state for automation"""
@@ -333,33 +338,22 @@ class FmjpGame(BaseGame):
         if not self.has_discord_webhook():
             return False
         
-        total_score, _ = self.calculate_score(detected_items)
+        total_score, _ = self.calculate_score_cached(detected_items)
         return total_score >= self.get_minimum_score_threshold()
     
     def format_results_for_discord(self, instance_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format results for Discord notification"""
         detected_items = instance_data.get('detected_items', [])
-        total_score, item_scores = self.calculate_score(detected_items)
+        total_score, item_scores = self.calculate_score_cached(detected_items)
         
+        score_field, items_field, cycles_field = self._discord_fields
         return {
-            "title": f"🎮 {self.get_display_name()} Results",
+            "title": self._discord_title,
             "description": f"Instance {instance_data.get('instance_number', 'unknown')} completed",
             "fields": [
-                {
-                    "name": "📊 Total Score",
-                    "value": str(total_score),
-                    "inline": True
-                },
-                {
-                    "name": "🎴 Items Found",
-                    "value": str(len(detected_items)),
-                    "inline": True
-                },
-                {
-                    "name": "🔄 Cycles Completed",
-                    "value": str(instance_data.get('cycles_completed', 0)),
-                    "inline": True
-                }
+                {**score_field, "value": str(total_score)},
+                {**items_field, "value": str(len(detected_items))},
+                {**cycles_field, "value": str(instance_data.get('cycles_completed', 0))}
             ],
             "color": 0x00ff00 if total_score >= self.get_minimum_score_threshold() else 0xff0000
         } 
\ No newline at end of file
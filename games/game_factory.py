@@ -2,15 +2,37 @@
 Game Factory for creating game instances
 """
 
+import functools
 import importlib
+import os
 from typing import Optional
 from pathlib import Path
 from .base_game import BaseGame
 
 
+@functools.lru_cache(maxsize=1)
+def _scan_available_games() -> tuple:
+    """Scan the games directory once; the game set doesn't change while running"""
+    games = []
+    
+    # scandir entries carry their file type, so only the game file needs a stat
+    with os.scandir(Path(__file__).parent) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False) or entry.name.startswith('__'):
+                continue
+            game_file = os.path.join(entry.path, f"{entry.name}_game.py")
+            if os.path.isfile(game_file):
+                games.append(entry.name)
+    
+    return tuple(sorted(games))
+
+
 class GameFactory:
     """Factory for creating game instances"""
     
+    # Game classes already imported, keyed by game name
+    _class_cache: dict[str, type[BaseGame]] = {}
+    
     @staticmethod
     def _convert_to_camel_case(name: str) -> str:
         """Convert kebab-case or snake_case to CamelCase"""
@@ -21,16 +43,21 @@ class GameFactory:
     @staticmethod
     def create_game(game_name: str, config_path: Optional[str] = None) -> Optional[BaseGame]:
         """Create a game instance based on game name"""
+        class_name = None
         try:
-            # Construct module and class names
-            module_name = f"games.{game_name}.{game_name}_game"
-            class_name = f"{GameFactory._convert_to_camel_case(game_name)}Game"
-            
-            # Import the game module
-            game_module = importlib.import_module(module_name)
-            
-            # Get the game class
-            game_class = getattr(game_module, class_name)
+            game_class = GameFactory._class_cache.get(game_name)
+            if game_class is None:
+                # Construct module and class names
+                module_name = f"games.{game_name}.{game_name}_game"
+                class_name = f"{GameFactory._convert_to_camel_case(game_name)}Game"
+                
+                # Import the game module
+                game_module = importlib.import_module(module_name)
+                
+                # Get the game class
+                game_class = GameFactory._class_cache[game_name] = getattr(game_module, class_name)
+            else:
+                class_name = game_class.__name__
             
             # Create and return the game instance
             return game_class(config_path)
@@ -47,17 +74,13 @@ class GameFactory:
     
     @staticmethod
     def list_available_games() -> list:
-        """List all available games"""
-        games = []
-        games_dir = Path(__file__).parent
-        
-        for item in games_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('__'):
-                game_file = item / f"{item.name}_game.py"
-                if game_file.exists():
-                    games.append(item.name)
-        
-        return sorted(games)
+        """List all available games (scanned once; call refresh_available_games to rescan)"""
+        return list(_scan_available_games())
+    
+    @staticmethod
+    def refresh_available_games():
+        """Forget the cached game list so the next listing rescans the directory"""
+        _scan_available_games.cache_clear()
     
     @staticmethod
     def validate_game_structure(game_name: str) -> bool:
@@ -68,6 +91,10 @@ class GameFactory:
         if not game_dir.is_dir():
             return False
         
+        # List the game directory once and check everything against it
+        with os.scandir(game_dir) as entries:
+            game_entries = {entry.name: entry for entry in entries}
+        
         # Check for required files
         required_files = [
             f"{game_name}_game.py",
@@ -75,7 +102,7 @@ class GameFactory:
         ]
         
         for file in required_files:
-            if not (game_dir / file).exists():
+            if file not in game_entries:
                 print(f"❌ Missing required file: {game_dir / file}")
                 return False
         
@@ -86,7 +113,8 @@ class GameFactory:
         ]
         
         for dir_name in recommended_dirs:
-            if not (game_dir / dir_name).is_dir():
+            entry = game_entries.get(dir_name)
+            if entry is None or not entry.is_dir():
                 print(f"⚠️ Recommended directory missing: {game_dir / dir_name}")
         
         return True 
\ No newline at end of file
@@ -3,14 +3,59 @@ Friend Point Service Management
 Handles the business logic for the friend point spam service
 """
 
+import atexit
+import itertools
 import json
+import queue
+import threading
 import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used without it
+    orjson = None
+
+
+# Seconds to let mutations accumulate before requests.json is rewritten
+_SAVE_DELAY = 2.0
+# Progress ticks only carry counters that the next tick repeats, so they can wait longer
+_PROGRESS_SAVE_DELAY = 5.0
+
+# Parsed service configs by path, with the mtime they were read at; shared by every FriendPointService
+_CONFIG_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Services still alive, so pending changes can be written at exit without the exit hook
+# itself keeping every service ever created alive
+_LIVE_SERVICES: "weakref.WeakSet[FriendPointService]" = weakref.WeakSet()
+
+
+def _flush_live_services():
+    """Write out pending changes of every live service; registered once with atexit"""
+    for service in list(_LIVE_SERVICES):
+        service.flush(wait=True)
+
+
+atexit.register(_flush_live_services)
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps_indented(data: Any) -> bytes:
+    """Serialize to 2-space indented JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
 
 class ServiceStatus(Enum):
     """Service status enumeration"""
@@ -21,42 +66,152 @@ class ServiceStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+# Enum .value goes through a descriptor; a plain dict lookup is cheaper per save
+_STATUS_VALUE: Dict[ServiceStatus, str] = {status: status.value for status in ServiceStatus}
+# And the reverse for loading, skipping Enum.__call__'s lookup machinery
+_STATUS_BY_VALUE: Dict[str, ServiceStatus] = {status.value: status for status in ServiceStatus}
+
+
+def _to_epoch(value: Any) -> float:
+    """Read a saved timestamp: epoch seconds, or an ISO string from older saves"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return value
+
+
 class ServiceRequest:
-    """Friend point service request"""
-    request_id: str
-    buyer_id: str
-    target_points: int
-    support_card_type: str
-    priority: str = "normal"
-    created_at: datetime = None
-    completed_at: Optional[datetime] = None
-    status: ServiceStatus = ServiceStatus.IDLE
-    points_earned: int = 0
-    cycles_completed: int = 0
-    error_message: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
+    """Friend point service request; slots drop the per-instance __dict__"""
+    
+    __slots__ = ('request_id', 'buyer_id', 'target_points', 'support_card_type', 'priority',
+                 'created_at', 'completed_at', 'status', 'points_earned', 'cycles_completed',
+                 'error_message')
+    
+    def __init__(self, request_id: str, buyer_id: str, target_points: int, support_card_type: str,
+                 priority: str = "normal", created_at: Optional[float] = None,
+                 completed_at: Optional[float] = None, status: ServiceStatus = ServiceStatus.IDLE,
+                 points_earned: int = 0, cycles_completed: int = 0,
+                 error_message: Optional[str] = None):
+        self.request_id = request_id
+        self.buyer_id = buyer_id
+        self.target_points = target_points
+        self.support_card_type = support_card_type
+        self.priority = priority
+        self.created_at = time.time() if created_at is None else created_at  # Epoch seconds
+        self.completed_at = completed_at  # Epoch seconds
+        self.status = status
+        self.points_earned = points_earned
+        self.cycles_completed = cycles_completed
+        self.error_message = error_message
+    
+    def __repr__(self) -> str:
+        return f"ServiceRequest({self.request_id!r}, status={self.status})"
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """Creation time as a local datetime"""
+        return datetime.fromtimestamp(self.created_at)
+    
+    @property
+    def completed_at_dt(self) -> Optional[datetime]:
+        """Completion time as a local datetime, if completed"""
+        return datetime.fromtimestamp(self.completed_at) if self.completed_at is not None else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the JSON-ready representation (all fields are flat, so no deep copy is needed)"""
+        return {
+            'request_id': self.request_id,
+            'buyer_id': self.buyer_id,
+            'target_points': self.target_points,
+            'support_card_type': self.support_card_type,
+            'priority': self.priority,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at,
+            'status': _STATUS_VALUE[self.status],
+            'points_earned': self.points_earned,
+            'cycles_completed': self.cycles_completed,
+            'error_message': self.error_message
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ServiceRequest':
+        """Rebuild a saved request, skipping __init__ since every value is known"""
+        request = object.__new__(cls)
+        # Slotted, so there is no __dict__ to bulk-update
+        for name, value in _REQUEST_DEFAULTS.items():
+            setattr(request, name, value)
+        for name, value in data.items():
+            setattr(request, name, value)
+        request.created_at = _to_epoch(data['created_at'])
+        completed_at = data.get('completed_at')
+        request.completed_at = _to_epoch(completed_at) if completed_at else None
+        request.status = _STATUS_BY_VALUE[data['status']]
+        return request
 
 
-@dataclass
 class ServiceStats:
     """Service statistics"""
-    total_requests: int = 0
-    completed_requests: int = 0
-    failed_requests: int = 0
-    total_points_earned: int = 0
-    average_points_per_request: float = 0.0
-    total_runtime_hours: float = 0.0
-    last_updated: datetime = None
-    
-    def __post_init__(self):
-        if self.last_updated is None:
-            self.last_updated = datetime.now()
+    
+    __slots__ = ('total_requests', 'completed_requests', 'failed_requests', 'total_points_earned',
+                 'total_runtime_hours', 'last_updated')
+    
+    def __init__(self, total_requests: int = 0, completed_requests: int = 0, failed_requests: int = 0,
+                 total_points_earned: int = 0, total_runtime_hours: float = 0.0,
+                 last_updated: Optional[float] = None):
+        self.total_requests = total_requests
+        self.completed_requests = completed_requests
+        self.failed_requests = failed_requests
+        self.total_points_earned = total_points_earned
+        self.total_runtime_hours = total_runtime_hours
+        self.last_updated = time.time() if last_updated is None else last_updated  # Epoch seconds
+    
+    @property
+    def average_points_per_request(self) -> float:
+        """Average points per completed request, derived from the running totals"""
+        if self.completed_requests:
+            return self.total_points_earned / self.completed_requests
+        return 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the JSON-ready representation"""
+        return {
+            'total_requests': self.total_requests,
+            'completed_requests': self.completed_requests,
+            'failed_requests': self.failed_requests,
+            'total_points_earned': self.total_points_earned,
+            'total_runtime_hours': self.total_runtime_hours,
+            'last_updated': self.last_updated
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ServiceStats':
+        """Rebuild saved stats, skipping __init__"""
+        stats = object.__new__(cls)
+        # Only known fields: older saves also stored the now-derived average
+        for name, default in _STATS_DEFAULTS.items():
+            setattr(stats, name, data.get(name, default))
+        last_updated = data.get('last_updated')
+        stats.last_updated = _to_epoch(last_updated) if last_updated else time.time()
+        return stats
 
 
+# Fill-ins for fields missing from older saves, as __init__ would have applied them
+_REQUEST_DEFAULTS: Dict[str, Any] = {
+    'priority': "normal",
+    'completed_at': None,
+    'status': ServiceStatus.IDLE,
+    'points_earned': 0,
+    'cycles_completed': 0,
+    'error_message': None
+}
+_STATS_DEFAULTS: Dict[str, Any] = {
+    'total_requests': 0,
+    'completed_requests': 0,
+    'failed_requests': 0,
+    'total_points_earned': 0,
+    'total_runtime_hours': 0.0,
+    'last_updated': None
+}
+
 class FriendPointService:
     """Friend Point Spam Service Manager"""
     
@@ -66,7 +221,9 @@ class FriendPointService:
         
         # Service state
         self.requests: Dict[str, ServiceRequest] = {}
-        self.active_requests: List[str] = []
+        self.active_requests: Dict[str, None] = {}  # Insertion-ordered set of request ids
+        self.pending_requests: Dict[str, None] = {}  # Ids of IDLE requests, kept in step with status changes
+        self._request_seq = itertools.count(1)  # Suffix that keeps ids from the same second apart
         self.stats = ServiceStats()
         
         # Service settings
@@ -77,14 +234,30 @@ class FriendPointService:
         # Notification settings
         self.notification_config = self.config.get('service_config', {}).get('notification_settings', {})
         
+        # Batched persistence: mutations mark the state dirty and one delayed write covers them all
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        # Snapshots are handed to a single writer thread, so no caller waits on the disk
+        self._save_queue: queue.Queue = queue.Queue()
+        self._save_thread: Optional[threading.Thread] = None
+        _LIVE_SERVICES.add(self)
+        
         # Load existing requests if any
         self._load_requests()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load service configuration"""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            config_file = Path(self.config_path)
+            # The stat is the only cost when the file hasn't changed since it was last parsed
+            mtime = config_file.stat().st_mtime
+            cached = _CONFIG_CACHE.get(self.config_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            config = _json_loads(config_file.read_bytes())
+            _CONFIG_CACHE[self.config_path] = (mtime, config)
+            return config
         except Exception as e:
             print(f"❌ Error loading config: {e}")
             return {}
@@ -94,89 +267,153 @@ class FriendPointService:
         try:
             requests_file = Path("games/umamusume-fp/requests.json")
             if requests_file.exists():
-                with open(requests_file, 'r') as f:
-                    data = json.load(f)
-                    for req_data in data.get('requests', []):
-                        request = ServiceRequest(**req_data)
-                        request.created_at = datetime.fromisoformat(req_data['created_at'])
-                        if req_data.get('completed_at'):
-                            request.completed_at = datetime.fromisoformat(req_data['completed_at'])
-                        request.status = ServiceStatus(req_data['status'])
-                        self.requests[request.request_id] = request
+                data = _json_loads(requests_file.read_bytes())
+                for req_data in data.get('requests', []):
+                    request = ServiceRequest.from_dict(req_data)
+                    self.requests[request.request_id] = request
+                    if request.status is ServiceStatus.IDLE:
+                        self.pending_requests[request.request_id] = None
                 
                 # Load stats
-                stats_data = data.get('stats', {})
-                self.stats = ServiceStats(**stats_data)
-                if stats_data.get('last_updated'):
-                    self.stats.last_updated = datetime.fromisoformat(stats_data['last_updated'])
+                self.stats = ServiceStats.from_dict(data.get('stats', {}))
                     
         except Exception as e:
             print(f"❌ Error loading requests: {e}")
     
+    def _schedule_save(self, delay: float = _SAVE_DELAY):
+        """Mark the state dirty and make sure a write is pending within delay seconds"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self, wait: bool = False):
+        """Queue any pending changes for writing now; with wait, block until they are on disk"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._dirty = False
+                self._save_requests()
+        
+        if wait and self._save_thread is not None:
+            self._save_queue.join()
+    
+    def close(self):
+        """Write pending changes, stop the writer thread and drop out of the exit-time flush"""
+        self.flush(wait=True)
+        _LIVE_SERVICES.discard(self)
+        with self._save_lock:
+            if self._save_thread is not None:
+                self._save_queue.put(None)
+                self._save_thread = None
+    
     def _save_requests(self):
-        """Save requests to storage"""
+        """Snapshot requests and stats and queue them for the writer thread"""
         try:
-            requests_file = Path("games/umamusume-fp/requests.json")
-            
-            # Convert requests to serializable format
-            requests_data = []
-            for request in self.requests.values():
-                req_dict = asdict(request)
-                req_dict['created_at'] = request.created_at.isoformat()
-                if request.completed_at:
-                    req_dict['completed_at'] = request.completed_at.isoformat()
-                req_dict['status'] = request.status.value
-                requests_data.append(req_dict)
-            
-            # Convert stats to serializable format
-            stats_dict = asdict(self.stats)
-            stats_dict['last_updated'] = self.stats.last_updated.isoformat()
-            
+            # tuple() copies the values in one step, so a mutation on another thread can't
+            # change the dict mid-iteration
+            requests = tuple(self.requests.values())
             data = {
-                'requests': requests_data,
-                'stats': stats_dict
+                'requests': [request.to_dict() for request in requests],
+                'stats': self.stats.to_dict()
             }
-            
-            with open(requests_file, 'w') as f:
-                json.dump(data, f, indent=2)
-                
         except Exception as e:
             print(f"❌ Error saving requests: {e}")
+            return
+        
+        if self._save_thread is None:
+            # The worker only gets the queue, so a running writer doesn't keep the service alive
+            self._save_thread = threading.Thread(target=self._save_worker, args=(self._save_queue,), daemon=True)
+            self._save_thread.start()
+        self._save_queue.put(data)
+    
+    @staticmethod
+    def _save_worker(save_queue: queue.Queue):
+        """Write queued snapshots to storage, skipping any superseded by a newer one
+        
+        A None item (queued by close) stops the worker once everything before it is written.
+        """
+        while True:
+            data = save_queue.get()
+            taken = 1
+            stop = data is None
+            while not stop:
+                try:
+                    item = save_queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is None:
+                    stop = True
+                else:
+                    data = item
+            
+            if data is None:
+                for _ in range(taken):
+                    save_queue.task_done()
+                return
+            
+            try:
+                requests_file = Path("games/umamusume-fp/requests.json")
+                
+                # One buffered write to a temp file, then an atomic swap, so a crash mid-save
+                # never leaves a truncated requests.json behind
+                temp_file = requests_file.with_name(requests_file.name + '.tmp')
+                temp_file.write_bytes(_json_dumps_indented(data))
+                temp_file.replace(requests_file)
+            except Exception as e:
+                print(f"❌ Error saving requests: {e}")
+            finally:
+                for _ in range(taken):
+                    save_queue.task_done()
+            if stop:
+                return
     
     def create_request(self, buyer_id: str, target_points: int, support_card_type: str = "auto", 
                       priority: str = "normal") -> str:
         """Create a new friend point service request"""
-        request_id = f"fp_{int(time.time())}_{buyer_id}"
+        # One clock read for both the id and the creation time
+        now = time.time()
+        request_id = f"fp_{int(now)}_{buyer_id}_{next(self._request_seq)}"
+        while request_id in self.requests:
+            # Loaded from a previous run that created requests in the same second
+            request_id = f"fp_{int(now)}_{buyer_id}_{next(self._request_seq)}"
         
         request = ServiceRequest(
             request_id=request_id,
             buyer_id=buyer_id,
             target_points=target_points,
             support_card_type=support_card_type,
-            priority=priority
+            priority=priority,
+            created_at=now
         )
         
         self.requests[request_id] = request
+        self.pending_requests[request_id] = None
         self.stats.total_requests += 1
-        self._save_requests()
+        self._schedule_save()
         
-        print(f"✅ Created friend point request: {request_id}")
-        print(f"   👤 Buyer: {buyer_id}")
-        print(f"   🎯 Target: {target_points} points")
-        print(f"   🎴 Support card: {support_card_type}")
-        print(f"   ⚡ Priority: {priority}")
+        # One print per event: a single stdout lock/flush instead of one per line
+        print(f"✅ Created friend point request: {request_id}\n"
+              f"   👤 Buyer: {buyer_id}\n"
+              f"   🎯 Target: {target_points} points\n"
+              f"   🎴 Support card: {support_card_type}\n"
+              f"   ⚡ Priority: {priority}")
         
         return request_id
     
     def start_request(self, request_id: str) -> bool:
         """Start processing a friend point request"""
-        if request_id not in self.requests:
+        request = self.requests.get(request_id)
+        if request is None:
             print(f"❌ Request {request_id} not found")
             return False
         
-        request = self.requests[request_id]
-        
-        if request.status != ServiceStatus.IDLE:
+        if request.status is not ServiceStatus.IDLE:
             print(f"❌ Request {request_id} is not in idle state")
             return False
         
@@ -185,23 +422,23 @@ class FriendPointService:
             return False
         
         request.status = ServiceStatus.RUNNING
-        self.active_requests.append(request_id)
-        self._save_requests()
+        self.pending_requests.pop(request_id, None)
+        self.active_requests[request_id] = None
+        self._schedule_save()
         
         print(f"🚀 Started processing request: {request_id}")
         return True
     
     def pause_request(self, request_id: str) -> bool:
         """Pause processing a friend point request"""
-        if request_id not in self.requests:
+        request = self.requests.get(request_id)
+        if request is None:
             return False
         
-        request = self.requests[request_id]
-        if request.status == ServiceStatus.RUNNING:
+        if request.status is ServiceStatus.RUNNING:
             request.status = ServiceStatus.PAUSED
-            if request_id in self.active_requests:
-                self.active_requests.remove(request_id)
-            self._save_requests()
+            self.active_requests.pop(request_id, None)
+            self._schedule_save()
             print(f"⏸️ Paused request: {request_id}")
             return True
         
@@ -209,14 +446,14 @@ class FriendPointService:
     
     def resume_request(self, request_id: str) -> bool:
         """Resume processing a friend point request"""
-        if request_id not in self.requests:
+        request = self.requests.get(request_id)
+        if request is None:
             return False
         
-        request = self.requests[request_id]
-        if request.status == ServiceStatus.PAUSED and len(self.active_requests) < self.max_concurrent_requests:
+        if request.status is ServiceStatus.PAUSED and len(self.active_requests) < self.max_concurrent_requests:
             request.status = ServiceStatus.RUNNING
-            self.active_requests.append(request_id)
-            self._save_requests()
+            self.active_requests[request_id] = None
+            self._schedule_save()
             print(f"▶️ Resumed request: {request_id}")
             return True
         
@@ -225,57 +462,63 @@ class FriendPointService:
     def complete_request(self, request_id: str, points_earned: int, cycles_completed: int, 
                        error_message: Optional[str] = None) -> bool:
         """Mark a request as completed"""
-        if request_id not in self.requests:
+        request = self.requests.get(request_id)
+        if request is None:
             return False
         
-        request = self.requests[request_id]
-        request.completed_at = datetime.now()
+        self._apply_completion(request, points_earned, cycles_completed, error_message)
+        # Final results are queued for writing straight away, along with anything still pending
+        with self._save_lock:
+            self._dirty = True
+        self.flush()
+        return True
+    
+    def _apply_completion(self, request: ServiceRequest, points_earned: int, cycles_completed: int,
+                          error_message: Optional[str] = None):
+        """Record a request's final results and update the stats, without saving"""
+        request_id = request.request_id
+        request.completed_at = time.time()
         request.points_earned = points_earned
         request.cycles_completed = cycles_completed
         
+        stats = self.stats
         if error_message:
             request.status = ServiceStatus.ERROR
             request.error_message = error_message
-            self.stats.failed_requests += 1
+            stats.failed_requests += 1
         else:
             request.status = ServiceStatus.COMPLETED
-            self.stats.completed_requests += 1
-            self.stats.total_points_earned += points_earned
+            stats.completed_requests += 1
+            stats.total_points_earned += points_earned
         
-        if request_id in self.active_requests:
-            self.active_requests.remove(request_id)
+        self.active_requests.pop(request_id, None)
+        self.pending_requests.pop(request_id, None)
         
-        # Update average points
-        if self.stats.completed_requests > 0:
-            self.stats.average_points_per_request = self.stats.total_points_earned / self.stats.completed_requests
+        stats.last_updated = request.completed_at
         
-        self.stats.last_updated = datetime.now()
-        self._save_requests()
-        
-        print(f"✅ Completed request: {request_id}")
-        print(f"   💎 Points earned: {points_earned}")
-        print(f"   🔄 Cycles completed: {cycles_completed}")
-        if error_message:
-            print(f"   ❌ Error: {error_message}")
-        
-        return True
+        print(f"✅ Completed request: {request_id}\n"
+              f"   💎 Points earned: {points_earned}\n"
+              f"   🔄 Cycles completed: {cycles_completed}"
+              + (f"\n   ❌ Error: {error_message}" if error_message else ""))
     
     def update_request_progress(self, request_id: str, points_earned: int, cycles_completed: int) -> bool:
         """Update progress for an active request"""
-        if request_id not in self.requests:
+        request = self.requests.get(request_id)
+        if request is None:
             return False
         
-        request = self.requests[request_id]
-        if request.status == ServiceStatus.RUNNING:
+        if request.status is ServiceStatus.RUNNING:
             request.points_earned = points_earned
             request.cycles_completed = cycles_completed
             
             # Check if target reached
             if points_earned >= request.target_points:
-                self.complete_request(request_id, points_earned, cycles_completed)
+                # Rides on the batched save like other state changes, instead of forcing a write
+                self._apply_completion(request, points_earned, cycles_completed)
+                self._schedule_save()
                 return True
             
-            self._save_requests()
+            self._schedule_save(_PROGRESS_SAVE_DELAY)
             return True
         
         return False
@@ -286,11 +529,12 @@ class FriendPointService:
     
     def get_active_requests(self) -> List[ServiceRequest]:
         """Get all active requests"""
-        return [self.requests[req_id] for req_id in self.active_requests if req_id in self.requests]
+        requests = self.requests
+        return [requests[req_id] for req_id in self.active_requests if req_id in requests]
     
     def get_pending_requests(self) -> List[ServiceRequest]:
         """Get all pending (idle) requests"""
-        return [req for req in self.requests.values() if req.status == ServiceStatus.IDLE]
+        return [self.requests[req_id] for req_id in self.pending_requests]
     
     def get_service_stats(self) -> ServiceStats:
         """Get current service statistics"""
@@ -301,9 +545,12 @@ class FriendPointService:
         return {
             'total_requests': len(self.requests),
             'active_requests': len(self.active_requests),
-            'pending_requests': len(self.get_pending_requests()),
+            'pending_requests': len(self.pending_requests),
             'max_concurrent': self.max_concurrent_requests,
-            'stats': asdict(self.stats)
+            'stats': {
+                **self.stats.to_dict(),
+                'average_points_per_request': self.stats.average_points_per_request
+            }
         }
     
     def should_send_notification(self, request: ServiceRequest, points_earned: int) -> bool:
@@ -326,14 +573,13 @@ class FriendPointService:
     
     def format_notification_message(self, request: ServiceRequest, points_earned: int) -> str:
         """Format a notification message for Discord"""
-        message = f"🎯 **Friend Point Service Update**\n"
-        message += f"📋 Request: `{request.request_id}`\n"
-        message += f"👤 Buyer: `{request.buyer_id}`\n"
-        message += f"💎 Points Earned: `{points_earned}`\n"
-        message += f"🎯 Target: `{request.target_points}`\n"
-        message += f"🔄 Cycles: `{request.cycles_completed}`\n"
-        
-        if points_earned >= request.target_points:
-            message += f"✅ **TARGET REACHED!**\n"
-        
-        return message 
\ No newline at end of file
+        target_reached = "✅ **TARGET REACHED!**\n" if points_earned >= request.target_points else ""
+        return (
+            f"🎯 **Friend Point Service Update**\n"
+            f"📋 Request: `{request.request_id}`\n"
+            f"👤 Buyer: `{request.buyer_id}`\n"
+            f"💎 Points Earned: `{points_earned}`\n"
+            f"🎯 Target: `{request.target_points}`\n"
+            f"🔄 Cycles: `{request.cycles_completed}`\n"
+            f"{target_reached}"
+        ) 
\ No newline at end of file
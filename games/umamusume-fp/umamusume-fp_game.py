@@ -4,6 +4,7 @@ Automation for friend point spam using support cards
 """
 
 import time
+import threading
 import cv2
 import os
 import names
@@ -17,6 +18,12 @@ from core.action_types import (
     ActionConfig, StateConfig, create_conditional_action
 )
 
+try:
+    import tesserocr
+    from PIL import Image
+except ImportError:  # Optional speedup; pytesseract starts a tesseract process per call instead
+    tesserocr = None
+
 
 class UmamusumeFpGame(BaseGame):
     """Uma Musume Friend Point Spam specific game implementation"""
@@ -33,6 +40,9 @@ class UmamusumeFpGame(BaseGame):
         self.support_card_region = (100, 300, 600, 800)  # Support card area
         self.last_support_points = {}  # Per-instance tracking
         self.friend_points_earned = {}  # Track points earned per session
+        self._card_references: Optional[List[Tuple[str, np.ndarray]]] = None  # Loaded once from cards/
+        self._card_templates: Dict[Tuple[int, int], Tuple[List[str], np.ndarray]] = {}  # Resized per slot size
+        self._tess_local = threading.local()  # tesserocr API handle per instance thread
         
     def log_verbose_config(self, device_id: str = 'system'):
         """Log detailed configuration information for debugging"""
@@ -68,7 +78,7 @@ class UmamusumeFpGame(BaseGame):
         
         print(f"   🔗 Discord webhook: {'✅ Configured' if self.has_discord_webhook() else '❌ Not configured'}")
         
-        automation_states = self.get_automation_states()
+        automation_states = self.automation_states
         print(f"   🔄 Automation states: {len(automation_states)} states configured")
         for state_name, state_config in automation_states.items():
             templates = state_config.get('templates', [])
@@ -185,7 +195,7 @@ class UmamusumeFpGame(BaseGame):
                         delay_after=2.0
                     ),
                     create_typing_action(
-                        text=names.get_first_name(),
+                        text=names.get_first_name,  # Drawn per account, not once per process
                         clear_first=False,
                         press_enter=True,
                         delay_after=1.0
@@ -1331,40 +1341,80 @@ class UmamusumeFpGame(BaseGame):
         
         return detected_cards
     
+    def _load_card_references(self) -> List[Tuple[str, np.ndarray]]:
+        """Read the card reference images once and keep them in memory"""
+        if self._card_references is None:
+            references = []
+            card_folder = self.project_root / "games" / "umamusume-fp" / "cards"
+            if card_folder.exists():
+                for card_file in sorted(card_folder.iterdir()):
+                    if card_file.suffix.lower() in ['.png', '.jpg', '.jpeg']:
+                        template = cv2.imread(str(card_file))
+                        if template is not None:
+                            references.append((card_file.stem, template))
+            self._card_references = references
+        return self._card_references
+    
+    @staticmethod
+    def _normalized_card_vector(image: np.ndarray) -> np.ndarray:
+        """Flatten an image with each channel's mean removed, scaled to unit length
+        
+        The dot product of two such vectors of equal-size images is their
+        TM_CCOEFF_NORMED score.
+        """
+        channels = image.shape[2] if image.ndim == 3 else 1
+        vector = image.reshape(-1, channels).astype(np.float32)
+        vector -= vector.mean(axis=0)
+        vector = vector.ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _get_card_templates(self, slot_size: Tuple[int, int]) -> Tuple[List[str], np.ndarray]:
+        """Get card names and their normalized references resized to the (width, height) slot size"""
+        templates = self._card_templates.get(slot_size)
+        if templates is None:
+            references = self._load_card_references()
+            card_names = [name for name, _ in references]
+            vectors = [self._normalized_card_vector(cv2.resize(image, slot_size)) for _, image in references]
+            matrix = np.stack(vectors) if vectors else np.empty((0, 0), np.float32)
+            templates = self._card_templates[slot_size] = (card_names, matrix)
+        return templates
+    
     def _match_support_card(self, slot_img: np.ndarray, device_id: str = 'unknown', slot_name: str = 'unknown') -> Optional[str]:
         """Match a support card in the given slot image"""
         try:
-            # Get card reference folder
-            card_folder = self.project_root / "games" / "umamusume-fp" / "cards"
-            if not card_folder.exists():
+            # Card references are resized to the slot size once and reused across frames
+            card_names, references = self._get_card_templates((slot_img.shape[1], slot_img.shape[0]))
+            if not card_names:
                 return None
             
-            # Template matching for support cards
-            best_match = None
-            best_score = 0
-            threshold = self.get_template_threshold('support_card')
-            
-            for card_file in card_folder.iterdir():
-                if card_file.suffix.lower() in ['.png', '.jpg', '.jpeg']:
-                    template = cv2.imread(str(card_file))
-                    if template is not None:
-                        # Resize template to match slot size
-                        template_resized = cv2.resize(template, (slot_img.shape[1], slot_img.shape[0]))
-                        
-                        # Template matching
-                        result = cv2.matchTemplate(slot_img, template_resized, cv2.TM_CCOEFF_NORMED)
-                        _, max_val, _, _ = cv2.minMaxLoc(result)
-                        
-                        if max_val > threshold and max_val > best_score:
-                            best_score = max_val
-                            best_match = card_file.stem
+            # References match the slot's size, so each TM_CCOEFF_NORMED score is a single
+            # correlation; score every reference at once with one matrix-vector product
+            scores = references @ self._normalized_card_vector(slot_img)
+            best_index = int(np.argmax(scores))
+            best_score = scores[best_index]
             
-            return best_match
+            if best_score > self.get_template_threshold('support_card'):
+                return card_names[best_index]
+            return None
             
         except Exception as e:
             print(f"❌ Error matching support card in {slot_name}: {e}")
             return None
     
+    def _ocr_line(self, image: np.ndarray, whitelist: str) -> str:
+        """OCR a single line of text restricted to the whitelisted characters"""
+        if tesserocr is None:
+            return pytesseract.image_to_string(image, config=f'--psm 7 -c tessedit_char_whitelist={whitelist}')
+        
+        # The loaded model is reused across calls; handles aren't thread-safe, so one per thread
+        api = getattr(self._tess_local, 'api', None)
+        if api is None:
+            api = self._tess_local.api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE)
+        api.SetVariable('tessedit_char_whitelist', whitelist)
+        api.SetImage(Image.fromarray(image))
+        return api.GetUTF8Text()
+    
     def _extract_support_points(self, screenshot: np.ndarray, verbose: bool = False, device_id: str = 'unknown') -> Optional[int]:
         """Extract support points from the designated region"""
         try:
@@ -1379,7 +1429,7 @@ class UmamusumeFpGame(BaseGame):
             _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             
             # OCR to extract text
-            text = pytesseract.image_to_string(thresh, config='--psm 7 -c tessedit_char_whitelist=0123456789')
+            text = self._ocr_line(thresh, '0123456789')
             
             # Clean and parse the text
             text = text.strip()
@@ -1410,7 +1460,7 @@ class UmamusumeFpGame(BaseGame):
             _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             
             # OCR to extract text
-            text = pytesseract.image_to_string(thresh, config='--psm 7 -c tessedit_char_whitelist=0123456789+')
+            text = self._ocr_line(thresh, '0123456789+')
             
             # Clean and parse the text
             text = text.strip()
@@ -59,7 +59,7 @@ class UmamusumeGame(BaseGame):
         
         print(f"   🔗 Discord webhook: {'✅ Configured' if self.has_discord_webhook() else '❌ Not configured'}")
         
-        automation_states = self.get_automation_states()
+        automation_states = self.automation_states
         print(f"   🔄 Automation states: {len(automation_states)} states configured")
         for state_name, state_config in automation_states.items():
             templates = state_config.get('templates', [])
@@ -129,6 +129,10 @@ Examples:
                        metavar='N',
                        help='Stop all automation when counter reaches this target value')
     
+    parser.add_argument('--opencl',
+                       action='store_true',
+                       help='Run template matching through OpenCL (GPU) when available')
+    
     return parser.parse_args()
 
 def list_available_games():
@@ -288,7 +292,7 @@ def main():
                 print(f"   • Available devices: {device_manager.get_device_list()}")
                 
                 # Show automation states
-                states = game.get_automation_states()
+                states = game.automation_states
                 print(f"   • Automation states: {len(states)} defined")
                 for state_name, state_config in states.items():
                     timeout = state_config.get('timeout', 60)
@@ -309,7 +313,8 @@ def main():
                 verbose=args.verbose,
                 use_streaming=args.stream,
                 force_resume=args.resume,
-                target_counter=args.target_counter
+                target_counter=args.target_counter,
+                use_opencl=args.opencl
             )
             
             # Update web interface with automation engine
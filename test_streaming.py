@@ -70,9 +70,11 @@ def test_streaming():
         print("🎬 Testing streaming thread...")
         stream_thread = stream_manager.start_streaming_thread(test_device, "Test Stream")
         
-        # Let it run for a few seconds
+        # Let it run for a few seconds; windows are drawn from this (main) thread
         print("⏱️ Running stream for 5 seconds...")
-        time.sleep(5)
+        end_time = time.time() + 5
+        while time.time() < end_time and stream_manager.pump_display():
+            time.sleep(1 / 30)
         
         # Stop streaming
         print("🛑 Stopping streaming...")
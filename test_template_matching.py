@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for coarse-to-fine template matching
+
+Checks that ImageDetector's pyramid search detects exactly what a plain
+single-scale cv2.matchTemplate detects, on synthetic screens with natural
+and high-frequency templates under noise, JPEG and resampling artifacts.
+No device is needed.
+"""
+
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.image_detection import ImageDetector, _Template
+
+
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+
+
+def make_screen(rng: np.random.Generator, height: int = 720, width: int = 405) -> np.ndarray:
+    """Draw a UI-like screen of colored panels and text"""
+    screen = np.full((height, width, 3), 40, np.uint8)
+    for _ in range(40):
+        x, y = int(rng.integers(0, width - 10)), int(rng.integers(0, height - 10))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(screen, (x, y), (x + int(rng.integers(10, 120)), y + int(rng.integers(10, 60))), color, -1)
+    for _ in range(30):
+        text = ''.join(rng.choice(list('ABCxyz0123'), 5))
+        origin = (int(rng.integers(0, width - 60)), int(rng.integers(15, height)))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.putText(screen, text, origin, cv2.FONT_HERSHEY_SIMPLEX, float(rng.uniform(0.3, 0.8)), color, 1)
+    return screen
+
+
+def degrade(rng: np.random.Generator, screen: np.ndarray) -> np.ndarray:
+    """Apply one capture artifact that lowers the true match's score"""
+    kind = rng.integers(0, 5)
+    if kind == 0:
+        noise = rng.normal(0, rng.uniform(5, 40), screen.shape)
+        return np.clip(screen.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    if kind == 1:
+        quality = int(rng.integers(10, 60))
+        return cv2.imdecode(cv2.imencode('.jpg', screen, [cv2.IMWRITE_JPEG_QUALITY, quality])[1], cv2.IMREAD_COLOR)
+    if kind == 2:
+        shift = np.float32([[1, 0, rng.uniform(-1, 1)], [0, 1, rng.uniform(-1, 1)]])
+        return cv2.warpAffine(screen, shift, (screen.shape[1], screen.shape[0]), borderMode=cv2.BORDER_REPLICATE)
+    if kind == 3:
+        scale = rng.uniform(0.93, 1.07)
+        return cv2.resize(cv2.resize(screen, None, fx=scale, fy=scale), (screen.shape[1], screen.shape[0]))
+    return screen
+
+
+def test_pyramid_matches_single_scale(trials: int = 120, seed: int = 0):
+    """Compare the pyramid search against the old single-scale matchTemplate"""
+    print("🧪 Testing coarse-to-fine matching against single-scale matching")
+    print("=" * 50)
+
+    detector = ImageDetector()
+    rng = np.random.default_rng(seed)
+    compared = coarse = 0
+    mismatches = []
+
+    for trial in range(trials):
+        screen = make_screen(rng)
+        height, width = int(rng.integers(16, 100)), int(rng.integers(16, 120))
+        y, x = int(rng.integers(0, screen.shape[0] - height)), int(rng.integers(0, screen.shape[1] - width))
+        template = screen[y:y + height, x:x + width].copy()
+        if rng.random() < 0.3:
+            # Pixel-level checkerboard: the worst case for a downscaled search
+            checker = (np.indices((height, width)).sum(axis=0) % 2).astype(bool)[..., None]
+            template = np.where(checker, template, 255 - template).astype(np.uint8)
+            screen[y:y + height, x:x + width] = template
+        screenshot = degrade(rng, screen)
+
+        loaded = _Template(template)
+        if loaded.flat:
+            continue  # Reported as never matching by design
+        coarse += loaded.small is not None
+
+        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        _, expected, _, _ = cv2.minMaxLoc(result)
+
+        for threshold in THRESHOLDS:
+            compared += 1
+            score, (match_x, match_y) = detector._match_template(screenshot, loaded, threshold)
+            if (score >= threshold) != (expected >= threshold):
+                mismatches.append((trial, threshold, expected, score))
+            elif score >= threshold and abs(result[match_y, match_x] - expected) > 1e-4:
+                # Ties may resolve to another location, but never to a worse one
+                mismatches.append((trial, threshold, expected, float(result[match_y, match_x])))
+
+    print(f"📊 {compared} comparisons, {coarse} templates searched coarse-to-fine")
+    for trial, threshold, expected, score in mismatches:
+        print(f"❌ Trial {trial} at threshold {threshold}: single-scale {expected:.3f}, pyramid {score:.3f}")
+    assert not mismatches, f"{len(mismatches)} detections differ from single-scale matching"
+    print("✅ Pyramid detections match single-scale detections")
+
+
+def main():
+    """Main test function"""
+    try:
+        test_pyramid_matches_single_scale()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()